@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 
 from specforge import events
@@ -23,6 +24,12 @@ def _parse_json_response(content: str) -> dict:
     return json.loads(text)
 
 
+@functools.lru_cache(maxsize=1)
+def _design_schema_json() -> str:
+    """SystemDesign JSON schema for the manual-parse prompt (static, built once)."""
+    return json.dumps(SystemDesign.model_json_schema(), indent=2)
+
+
 def architect_node(state: AgentState) -> dict:
     """LangGraph node: Architect agent.
 
@@ -50,7 +57,7 @@ def architect_node(state: AgentState) -> dict:
                 # Fallback: manual JSON parse
                 console.print("  [warning]Using manual JSON parse...[/warning]")
                 events.emit("architect", "progress", "Using manual JSON parse...", _run_callback=_cb)
-                json_schema = json.dumps(SystemDesign.model_json_schema(), indent=2)
+                json_schema = _design_schema_json()
                 extra = (
                     "\n\nReturn your response as a single JSON object conforming to this schema:\n"
                     f"{json_schema}\n"
@@ -9,9 +9,15 @@ from collections import defaultdict
 from specforge import events
 from specforge.models import AgentState
 from specforge.providers import LlmProvider, get_provider as get_global_provider
+from specforge.utils import fastjson
 from specforge.utils.console import console, print_agent_done, print_agent_error, print_agent_start
 
 
+# JSON object inside a ```json / ``` fence. Greedy, so nested braces and
+# fences inside file contents (e.g. a README) don't end the match early.
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+
+
 def _parse_files_response(content: str) -> dict[str, str]:
     """Parse the LLM response into a dict of filepath -> content.
 
@@ -22,19 +28,19 @@ def _parse_files_response(content: str) -> dict[str, str]:
     """
     text = content.strip()
 
-    # Try 1: Pure JSON
+    # Try 1: Pure JSON (checked first — file contents may contain fences)
     if text.startswith("{"):
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return fastjson.loads(text)
+        except ValueError:
             pass
 
     # Try 2: Extract from code fences (```json ... ```)
-    fence_match = re.search(r"```(?:json)?\s*\n(\{.*?\})\s*\n```", text, re.DOTALL)
+    fence_match = _FENCE_RE.search(text)
     if fence_match:
         try:
-            return json.loads(fence_match.group(1))
-        except json.JSONDecodeError:
+            return fastjson.loads(fence_match.group(1))
+        except ValueError:
             pass
 
     # Try 3: Find the first { and last } — extract the JSON object
@@ -43,8 +49,8 @@ def _parse_files_response(content: str) -> dict[str, str]:
     if first_brace != -1 and last_brace > first_brace:
         candidate = text[first_brace:last_brace + 1]
         try:
-            return json.loads(candidate)
-        except json.JSONDecodeError:
+            return fastjson.loads(candidate)
+        except ValueError:
             pass
 
     raise json.JSONDecodeError("No valid JSON object found in response", text, 0)
@@ -211,11 +217,13 @@ def _build_dynamic_batches(system_design: dict) -> list[dict]:
         "5. README.md - Setup and usage instructions"
     )
 
+    # Batches in the same stage don't depend on each other and are sent together.
+    # Later stages see earlier stages' files as import context.
     return [
-        {"name": "core", "instruction": core_instruction},
-        {"name": "routers", "instruction": router_instruction},
-        {"name": "tests", "instruction": test_instruction},
-        {"name": "infra", "instruction": infra_instruction},
+        {"name": "core", "stage": 0, "instruction": core_instruction},
+        {"name": "routers", "stage": 1, "instruction": router_instruction},
+        {"name": "tests", "stage": 2, "instruction": test_instruction},
+        {"name": "infra", "stage": 2, "instruction": infra_instruction},
     ]
 
 
@@ -301,6 +309,61 @@ def _condense_system_design(system_design: dict) -> str:
     return "\n".join(lines)
 
 
+def _build_batch_prompt(
+    batch: dict, system_design_text: str, error_context: str, all_files: dict[str, str],
+) -> str:
+    """Build the user prompt for one batch."""
+    prompt = (
+        f"System Design:\n{system_design_text}\n\n"
+        f"{batch['instruction']}\n"
+        f"Return ONLY a JSON object mapping file paths to complete file contents."
+    )
+
+    if error_context:
+        # Truncate error context to avoid exceeding token limits
+        truncated_error = error_context
+        if len(truncated_error) > 4000:
+            truncated_error = truncated_error[:4000] + "\n... (truncated)"
+        prompt += f"\n\n{truncated_error}\n\nFix ALL issues from previous errors above."
+
+    # Include previously generated files as context (only file list + relevant files)
+    if all_files:
+        existing = "\n\nAlready generated files (for import reference):\n"
+        for fp, content in sorted(all_files.items()):
+            lines = content.split("\n")[:40]
+            existing += f"\n--- {fp} ---\n" + "\n".join(lines) + "\n"
+            if len(existing) > 8000:
+                existing += "\n... (remaining files omitted for brevity)\n"
+                break
+        prompt += existing
+
+    return prompt
+
+
+def _parse_batch_with_retries(
+    provider: LlmProvider, batch: dict, batch_system: str, prompt: str, response: str | None,
+    _run_callback=None,
+) -> dict[str, str]:
+    """Parse a batch response, re-prompting up to 2 times on parse failure."""
+    for attempt in range(3):
+        try:
+            if attempt > 0:
+                response = provider.invoke(batch_system, prompt)
+            if not response or not response.strip():
+                raise ValueError("Empty response from LLM")
+            batch_files = _parse_files_response(response)
+            console.print(f"    Got {len(batch_files)} files")
+            events.emit("coder", "progress", f"Got {len(batch_files)} {batch['name']} files", _run_callback=_run_callback)
+            return batch_files
+        except (json.JSONDecodeError, ValueError) as e:
+            preview = (response[:200] + "...") if response and len(response) > 200 else response
+            console.print(f"    [warning]Retry {attempt + 1}: {e}[/warning]")
+            console.print(f"    [warning]Response preview: {preview!r}[/warning]")
+            if attempt >= 2:
+                raise
+    return {}
+
+
 def _generate_in_batches(
     system_design: dict, error_context: str = "", provider: LlmProvider | None = None,
     _run_callback=None,
@@ -308,6 +371,7 @@ def _generate_in_batches(
     """Generate files in batches to avoid token limits.
 
     Batches are built dynamically from SystemDesign — no hardcoded file names.
+    Batches sharing a stage are sent together through provider.invoke_many().
     """
     if provider is None:
         provider = get_global_provider()
@@ -320,54 +384,36 @@ def _generate_in_batches(
     # The batch instructions already contain the relevant details per batch.
     system_design_text = _condense_system_design(system_design)
 
+    stages: dict[int, list[dict]] = defaultdict(list)
     for batch in batches:
-        console.print(f"    Generating {batch['name']} files...")
-        events.emit("coder", "progress", f"Generating {batch['name']} files...", _run_callback=_run_callback)
-        prompt = (
-            f"System Design:\n{system_design_text}\n\n"
-            f"{batch['instruction']}\n"
-            f"Return ONLY a JSON object mapping file paths to complete file contents."
-        )
+        stages[batch["stage"]].append(batch)
 
-        if error_context:
-            # Truncate error context to avoid exceeding token limits
-            truncated_error = error_context
-            if len(truncated_error) > 4000:
-                truncated_error = truncated_error[:4000] + "\n... (truncated)"
-            prompt += f"\n\n{truncated_error}\n\nFix ALL issues from previous errors above."
-
-        # Include previously generated files as context (only file list + relevant files)
-        if all_files:
-            existing = "\n\nAlready generated files (for import reference):\n"
-            for fp, content in sorted(all_files.items()):
-                lines = content.split("\n")[:40]
-                existing += f"\n--- {fp} ---\n" + "\n".join(lines) + "\n"
-                if len(existing) > 8000:
-                    existing += "\n... (remaining files omitted for brevity)\n"
-                    break
-            prompt += existing
-
-        # Log prompt size for debugging
-        total_prompt_size = len(batch_system) + len(prompt)
-        console.print(f"    Prompt size: {total_prompt_size:,} chars (system: {len(batch_system):,}, user: {len(prompt):,})")
-
-        # Retry up to 2 times on parse failure
-        for attempt in range(3):
-            try:
-                response = provider.invoke(batch_system, prompt)
-                if not response or not response.strip():
-                    raise ValueError("Empty response from LLM")
-                batch_files = _parse_files_response(response)
-                all_files.update(batch_files)
-                console.print(f"    Got {len(batch_files)} files")
-                events.emit("coder", "progress", f"Got {len(batch_files)} {batch['name']} files", _run_callback=_run_callback)
-                break
-            except (json.JSONDecodeError, ValueError) as e:
-                preview = (response[:200] + "...") if response and len(response) > 200 else response
-                console.print(f"    [warning]Retry {attempt + 1}: {e}[/warning]")
-                console.print(f"    [warning]Response preview: {preview!r}[/warning]")
-                if attempt >= 2:
-                    raise
+    for _, stage_batches in sorted(stages.items()):
+        prompts = []
+        for batch in stage_batches:
+            console.print(f"    Generating {batch['name']} files...")
+            events.emit("coder", "progress", f"Generating {batch['name']} files...", _run_callback=_run_callback)
+            prompt = _build_batch_prompt(batch, system_design_text, error_context, all_files)
+
+            # Log prompt size for debugging
+            total_prompt_size = len(batch_system) + len(prompt)
+            console.print(f"    Prompt size: {total_prompt_size:,} chars (system: {len(batch_system):,}, user: {len(prompt):,})")
+            prompts.append(prompt)
+
+        try:
+            if len(prompts) > 1:
+                responses = provider.invoke_many([(batch_system, p) for p in prompts])
+            else:
+                responses = [provider.invoke(batch_system, prompts[0])]
+        except ValueError as e:
+            # Treat a failed first attempt like an empty response — retried below
+            console.print(f"    [warning]Batch request failed: {e}[/warning]")
+            responses = [None] * len(prompts)
+
+        for batch, prompt, response in zip(stage_batches, prompts, responses):
+            all_files.update(_parse_batch_with_retries(
+                provider, batch, batch_system, prompt, response, _run_callback=_run_callback,
+            ))
 
     return all_files
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import re
 import subprocess
+from collections import Counter
 from pathlib import Path
 
 from specforge import events
@@ -12,9 +13,10 @@ from specforge.models import AgentState, TestRunResult
 from specforge.prompts.tester import ANALYSIS_PROMPT
 from specforge.providers import get_provider as get_global_provider
 from specforge.utils.console import (
+    build_test_results_table,
     console,
-    print_agent_done,
     print_agent_error,
+    print_agent_phase,
     print_agent_start,
     print_test_results,
 )
@@ -51,6 +53,11 @@ def _run_pytest(output_dir: str) -> tuple[int, str]:
     return result.returncode, output
 
 
+_PASSED_RE = re.compile(r"(\d+) passed")
+_FAILED_RE = re.compile(r"(\d+) failed")
+_ERRORS_RE = re.compile(r"(\d+) error")
+
+
 def _parse_pytest_output(output: str) -> tuple[int, int, int, int]:
     """Parse pytest output to extract test counts.
 
@@ -58,15 +65,15 @@ def _parse_pytest_output(output: str) -> tuple[int, int, int, int]:
     """
     passed = failed = errors = 0
 
-    match = re.search(r"(\d+) passed", output)
+    match = _PASSED_RE.search(output)
     if match:
         passed = int(match.group(1))
 
-    match = re.search(r"(\d+) failed", output)
+    match = _FAILED_RE.search(output)
     if match:
         failed = int(match.group(1))
 
-    match = re.search(r"(\d+) error", output)
+    match = _ERRORS_RE.search(output)
     if match:
         errors = int(match.group(1))
 
@@ -74,37 +81,32 @@ def _parse_pytest_output(output: str) -> tuple[int, int, int, int]:
     return total, passed, failed, errors
 
 
+# A pytest output line that reports an error or failure
+_ERROR_LINE_RE = re.compile(r"^.*(?:Error:|Exception:|FAILED|ImportError).*$", re.MULTILINE)
+
+
+def _normalize_error_line(line: str) -> str:
+    """Strip the test-id prefix ('FAILED tests/x.py::t - ...'), keep just the error."""
+    line = line.strip()
+    _, sep, error_part = line.partition(" - ")
+    return error_part.strip() if sep else line
+
+
 def _deduplicate_errors(pytest_output: str) -> str:
     """Extract unique error types from pytest output with counts.
 
     Turns 78 identical 'ValueError: password cannot be loaded' lines
     into '(×78) ValueError: password cannot be loaded'.
     """
-    from collections import Counter
-
-    error_lines: list[str] = []
-    for line in pytest_output.split("\n"):
-        line = line.strip()
-        # Match common error patterns
-        if any(marker in line for marker in ("Error:", "Exception:", "FAILED", "ImportError")):
-            # Normalize: strip test name prefix, keep just the error
-            if " - " in line:
-                error_part = line.split(" - ", 1)[1].strip()
-            elif "ERROR " in line:
-                error_part = line
-            elif "FAILED " in line:
-                error_part = line
-            else:
-                error_part = line
-            error_lines.append(error_part)
-
-    if not error_lines:
+    # One regex pass finds the error lines; only those get normalized
+    counts = Counter(_normalize_error_line(m.group()) for m in _ERROR_LINE_RE.finditer(pytest_output))
+
+    if not counts:
         # Fall back to last 20 lines
         lines = [l.strip() for l in pytest_output.strip().split("\n") if l.strip()]
         return "\n".join(lines[-20:])
 
     # Count unique errors
-    counts = Counter(error_lines)
     deduped = []
     for error, count in counts.most_common(15):  # Top 15 unique errors
         if count > 1:
@@ -291,7 +293,6 @@ def tester_node(state: AgentState) -> dict:
             returncode, pytest_output = _run_pytest(output_dir)
 
         total, passed, failed, errors = _parse_pytest_output(pytest_output)
-        print_test_results(passed, failed, errors, total)
         events.emit("tester", "test_results",
                      f"{passed}/{total} passed",
                      iteration=iteration, _run_callback=_cb,
@@ -304,12 +305,20 @@ def tester_node(state: AgentState) -> dict:
             errors = 1
             all_passed = False
 
+        if not all_passed:
+            # The FAIL line only follows after failure analysis (an LLM call)
+            print_test_results(passed, failed, errors, total)
+
         # Determine if this is the final iteration
         max_iterations = state.get("max_iterations", 4)
         is_final = all_passed or (iteration >= max_iterations)
 
         if all_passed:
-            print_agent_done("Tester", f"All {total} tests passed!")
+            # Results table + done line in one render
+            print_agent_phase(
+                "Tester", f"All {total} tests passed!",
+                table=build_test_results_table(passed, failed, errors, total),
+            )
             events.emit("tester", "done", f"All {total} tests passed!", iteration=iteration, _run_callback=_cb)
 
         # Run verification on final iteration (success or last attempt)
@@ -454,7 +454,9 @@ def run_verification(
 
 def print_verification_report(report: VerificationReport) -> None:
     """Print a Rich table with the verification results."""
+    from rich.console import Group
     from rich.table import Table
+    from rich.text import Text
 
     table = Table(title="Verification Report", show_lines=True)
     table.add_column("Check", style="bold")
@@ -485,8 +487,8 @@ def print_verification_report(report: VerificationReport) -> None:
         style="bold",
     )
 
-    console.print()
-    console.print(table)
+    # Blank line + table in a single render
+    console.print(Group(Text(), table))
 
 
 # ── Helper ──────────────────────────────────────────────────────────
@@ -246,20 +246,26 @@ def example(
     ),
 ) -> None:
     """Show or copy the built-in example spec (URL Shortener)."""
-    example_path = Path(__file__).parent / "examples" / "advanced-shortener-sqlite.md"
+    from importlib.resources import files
 
-    if not example_path.exists():
+    example_spec = files("specforge.examples").joinpath("advanced-shortener-sqlite.md")
+
+    if not example_spec.is_file():
         console.print("[error]Error: Built-in example spec not found.[/error]")
         raise typer.Exit(1)
 
-    content = example_path.read_text(encoding="utf-8")
-
     if copy_to:
-        copy_to.write_text(content, encoding="utf-8")
+        # Raw byte copy — no need to decode/re-encode the spec
+        copy_to.write_bytes(example_spec.read_bytes())
         console.print(f"[success][OK] Example spec copied to {copy_to}[/success]")
     else:
-        from rich.text import Text
-        console.print(Text(content))
+        # Print verbatim: no markup, emoji codes or highlighting in the spec
+        console.print(
+            example_spec.read_text(encoding="utf-8"),
+            markup=False,
+            emoji=False,
+            highlight=False,
+        )
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 
 from dotenv import load_dotenv
@@ -26,26 +27,34 @@ def get_model() -> str:
     return _current_model
 
 
+# Leading model-name token -> provider (e.g. "kimi-k2.5" -> "kimi")
+_PREFIX_PROVIDERS = {
+    "claude": "anthropic",
+    "kimi": "moonshot",
+    "moonshot": "moonshot",
+    "deepseek": "deepseek",
+}
+
+
+@functools.lru_cache(maxsize=32)
 def _detect_provider(model: str) -> str:
     """Detect which provider a model belongs to.
 
     Returns: 'anthropic', 'openrouter', 'moonshot', 'deepseek', or 'openai'.
     """
-    # Anthropic native
-    if model.startswith("claude") and "/" not in model:
-        return "anthropic"
-
     # OpenRouter: any model with org/name format (e.g. moonshotai/Kimi-K2.5)
     if "/" in model:
         return "openrouter"
 
-    # Moonshot direct API
-    if model.startswith(("kimi", "moonshot")):
-        return "moonshot"
+    head = model.split("-", 1)[0].split(".", 1)[0]
+    provider = _PREFIX_PROVIDERS.get(head)
+    if provider is not None:
+        return provider
 
-    # DeepSeek
-    if model.startswith("deepseek"):
-        return "deepseek"
+    # Unusual names (e.g. "claude3") still match on plain prefix
+    for prefix, provider in _PREFIX_PROVIDERS.items():
+        if model.startswith(prefix):
+            return provider
 
     return "openai"
 
@@ -113,40 +122,34 @@ def get_llm(temperature: float = 0.1, max_tokens: int | None = None, *, api_key:
     return ChatOpenAI(**kwargs, **extra)
 
 
+# Placeholder values shipped in .env.example — treated as "not set"
+_PLACEHOLDER_KEYS = {
+    "ANTHROPIC_API_KEY": "sk-ant-your",
+    "OPENAI_API_KEY": "sk-your",
+}
+
+
+def _api_key_env_var(provider: str) -> str:
+    """Name of the environment variable holding the API key for a provider."""
+    if provider == "anthropic":
+        return "ANTHROPIC_API_KEY"
+    if provider in PROVIDER_CONFIG:
+        return PROVIDER_CONFIG[provider][0]
+    return "OPENAI_API_KEY"
+
+
 def validate_api_key() -> tuple[bool, str]:
     """Check that the required API key is set for the current model.
 
     Returns (is_valid, error_message).
     """
-    model = get_model()
-    provider = _detect_provider(model)
+    env_var = _api_key_env_var(_detect_provider(get_model()))
+    key = os.environ.get(env_var, "")
+    placeholder = _PLACEHOLDER_KEYS.get(env_var)
 
-    if provider == "anthropic":
-        key = os.environ.get("ANTHROPIC_API_KEY", "")
-        if not key or key.startswith("sk-ant-your"):
-            return False, (
-                "ANTHROPIC_API_KEY not set.\n"
-                "Set it in your environment or create a .env file.\n"
-                "See .env.example for details."
-            )
-        return True, ""
-
-    if provider in PROVIDER_CONFIG:
-        env_var, _ = PROVIDER_CONFIG[provider]
-        key = os.environ.get(env_var, "")
-        if not key:
-            return False, (
-                f"{env_var} not set.\n"
-                f"Set it in your environment or create a .env file.\n"
-                f"See .env.example for details."
-            )
-        return True, ""
-
-    # OpenAI
-    key = os.environ.get("OPENAI_API_KEY", "")
-    if not key or key.startswith("sk-your"):
+    if not key or (placeholder is not None and key.startswith(placeholder)):
         return False, (
-            "OPENAI_API_KEY not set.\n"
+            f"{env_var} not set.\n"
             "Set it in your environment or create a .env file.\n"
             "See .env.example for details."
         )
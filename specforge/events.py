@@ -6,8 +6,11 @@ Emits structured events that can be consumed by CLI (Rich console) or Web (WebSo
 from __future__ import annotations
 
 from dataclasses import dataclass, field, asdict
+from functools import cached_property
 from typing import Callable
 
+from specforge.utils import fastjson
+
 
 @dataclass
 class ProgressEvent:
@@ -21,6 +24,15 @@ class ProgressEvent:
     def to_dict(self) -> dict:
         return asdict(self)
 
+    @cached_property
+    def json_bytes(self) -> bytes:
+        """to_dict() as compact JSON, encoded once however many sinks send it.
+
+        Events are treated as immutable once emitted — changes made after the
+        first access won't show up here.
+        """
+        return fastjson.dumps(self.to_dict())
+
 
 # Type for event handler callbacks
 EventHandler = Callable[[ProgressEvent], None]
@@ -5,7 +5,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, TypedDict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ── System Design Models ─────────────────────────────────────────────
@@ -39,6 +39,8 @@ class AuthType(str, Enum):
 class SchemaField(BaseModel):
     """A field in a request/response schema."""
 
+    model_config = ConfigDict(use_enum_values=True)
+
     name: str = Field(description="Field name")
     type: FieldType = Field(description="Field data type")
     is_required: bool = Field(default=True, description="Whether the field is required")
@@ -62,6 +64,8 @@ class ResponseSchema(BaseModel):
 class Endpoint(BaseModel):
     """A single API endpoint."""
 
+    model_config = ConfigDict(use_enum_values=True)
+
     method: HttpMethod = Field(description="HTTP method")
     path: str = Field(description="URL path (e.g. /api/links)")
     summary: str = Field(description="Short description of what this endpoint does")
@@ -76,6 +80,8 @@ class Endpoint(BaseModel):
 class DatabaseField(BaseModel):
     """A column/field in a database table."""
 
+    model_config = ConfigDict(use_enum_values=True)
+
     name: str = Field(description="Column name")
     type: FieldType = Field(description="Column data type")
     primary_key: bool = Field(default=False, description="Is this the primary key?")
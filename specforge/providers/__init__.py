@@ -9,8 +9,35 @@ Thread-safe via RunConfig: each generation run gets its own config and provider
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Callable, Protocol, runtime_checkable
+from typing import Any, Callable, Protocol, runtime_checkable
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from specforge.config import get_llm, get_model
+from specforge.providers.cache import get_llm_cache, make_key
+from specforge.providers.semantic_cache import SemanticCacheProvider, semantic_cache_enabled
+
+__all__ = [
+    "ApiProvider",
+    "LlmProvider",
+    "PiProvider",
+    "RunConfig",
+    "SemanticCacheProvider",
+    "get_provider",
+    "set_provider_type",
+    "stop_provider",
+]
+
+# Max in-flight requests for ApiProvider.invoke_many
+MAX_BATCH_CONCURRENCY = 8
+
+# Background Pi startup (PiProvider.preload). start() returns within a
+# fraction of a second, so a small shared pool is plenty.
+_PI_START_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pi-start")
 
 
 @runtime_checkable
@@ -21,6 +48,10 @@ class LlmProvider(Protocol):
         """Send a prompt and return the text response."""
         ...
 
+    def invoke_many(self, prompts: list[tuple[str, str]]) -> list[str]:
+        """Send several independent (system, user) prompts. Returns responses in order."""
+        ...
+
     def invoke_structured(self, system_prompt: str, user_prompt: str, schema_class):
         """Try to get a structured response. Returns parsed object or None on failure."""
         ...
@@ -36,40 +67,109 @@ class ApiProvider:
     def __init__(self, model: str | None = None, api_key: str | None = None):
         self._model = model
         self._api_key = api_key
+        # LLM clients keyed by (model, temperature) — reuses the HTTP connection pool
+        self._llm_cache: dict[tuple[str, float], Any] = {}
+        self._llm_lock = threading.Lock()
 
     def invoke(self, system_prompt: str, user_prompt: str) -> str:
-        from langchain_core.messages import HumanMessage, SystemMessage
         llm = self._get_llm(temperature=0.1)
+        key, cached = self._cache_lookup(llm, system_prompt, user_prompt)
+        if cached is not None:
+            return cached
+
         messages = [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt),
         ]
         response = llm.invoke(messages)
+        self._cache_store(key, response.content)
         return response.content
 
+    def invoke_many(self, prompts: list[tuple[str, str]]) -> list[str]:
+        """Send independent prompts concurrently via langchain's batch()."""
+        llm = self._get_llm(temperature=0.1)
+        results: list[str | None] = [None] * len(prompts)
+        keys: list[str | None] = [None] * len(prompts)
+        pending: list[int] = []
+
+        for i, (system_prompt, user_prompt) in enumerate(prompts):
+            keys[i], results[i] = self._cache_lookup(llm, system_prompt, user_prompt)
+            if results[i] is None:
+                pending.append(i)
+
+        if pending:
+            batch = [
+                [SystemMessage(content=prompts[i][0]), HumanMessage(content=prompts[i][1])]
+                for i in pending
+            ]
+            responses = llm.batch(batch, config={"max_concurrency": MAX_BATCH_CONCURRENCY})
+            for i, response in zip(pending, responses):
+                results[i] = response.content
+                self._cache_store(keys[i], response.content)
+
+        return results
+
     def invoke_structured(self, system_prompt: str, user_prompt: str, schema_class):
-        from langchain_core.messages import HumanMessage, SystemMessage
         llm = self._get_llm(temperature=0.2)
+        key, cached = self._cache_lookup(llm, system_prompt, user_prompt, schema_class)
+        if cached is not None:
+            try:
+                return schema_class.model_validate_json(cached)
+            except ValueError:
+                pass  # Stale/incompatible entry — fetch a fresh one
+
         try:
             structured_llm = llm.with_structured_output(schema_class)
             messages = [
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=user_prompt),
             ]
-            return structured_llm.invoke(messages)
+            result = structured_llm.invoke(messages)
         except Exception:
             return None
+        if result is not None and hasattr(result, "model_dump_json"):
+            self._cache_store(key, result.model_dump_json())
+        return result
+
+    def _cache_lookup(
+        self, llm, system_prompt: str, user_prompt: str, schema_class=None,
+    ) -> tuple[str | None, str | None]:
+        """Look a request up in the LLM cache. Returns (key, cached text).
+
+        The key uses the temperature the client actually runs at — get_llm()
+        may override the requested one. key is None when caching is off.
+        """
+        cache = get_llm_cache()
+        if cache is None:
+            return None, None
+        key = make_key(self._resolved_model(), llm.temperature, system_prompt, user_prompt, schema_class)
+        return key, cache.get(key)
+
+    def _cache_store(self, key: str | None, text) -> None:
+        """Store a non-empty text response under a key from _cache_lookup()."""
+        cache = get_llm_cache()
+        if cache is not None and key is not None and isinstance(text, str) and text.strip():
+            cache.set(key, text)
+
+    def _resolved_model(self) -> str:
+        return self._model or get_model()
 
     def _get_llm(self, temperature: float = 0.1):
-        from specforge.config import get_llm
-        return get_llm(
-            temperature=temperature,
-            api_key=self._api_key,
-            model_override=self._model,
-        )
+        model = self._resolved_model()
+        with self._llm_lock:
+            llm = self._llm_cache.get((model, temperature))
+            if llm is None:
+                llm = get_llm(
+                    temperature=temperature,
+                    api_key=self._api_key,
+                    model_override=model,
+                )
+                self._llm_cache[(model, temperature)] = llm
+            return llm
 
     def stop(self) -> None:
-        pass  # Nothing to clean up
+        with self._llm_lock:
+            self._llm_cache.clear()
 
 
 class PiProvider:
@@ -79,10 +179,27 @@ class PiProvider:
         from specforge.providers.pi_rpc import PiRpcClient
         self._client = PiRpcClient()
         self._started = False
+        self._start_future: Future | None = None
+        self._start_lock = threading.Lock()
+
+    def preload(self) -> None:
+        """Start Pi in the background so the first invoke() doesn't wait for it.
+
+        Startup errors (e.g. Pi not installed) surface on the first invoke().
+        """
+        with self._start_lock:
+            if not self._started and self._start_future is None:
+                self._start_future = _PI_START_POOL.submit(self._client.start)
 
     def _ensure_started(self):
-        if not self._started:
-            self._client.start()
+        with self._start_lock:
+            if self._started:
+                return
+            future, self._start_future = self._start_future, None
+            if future is not None:
+                future.result()  # Re-raises a failed background start
+            else:
+                self._client.start()
             self._started = True
 
     def invoke(self, system_prompt: str, user_prompt: str) -> str:
@@ -91,23 +208,32 @@ class PiProvider:
         combined = f"{system_prompt}\n\n---\n\n{user_prompt}"
         return self._client.prompt(combined)
 
+    def invoke_many(self, prompts: list[tuple[str, str]]) -> list[str]:
+        # Pi RPC is a single conversation — prompts must go one at a time
+        return [self.invoke(system_prompt, user_prompt) for system_prompt, user_prompt in prompts]
+
     def invoke_structured(self, system_prompt: str, user_prompt: str, schema_class):
         # Pi RPC doesn't support structured output — always return None
         # Agents will fall back to manual JSON parsing
         return None
 
     def stop(self) -> None:
-        if self._started:
-            self._client.stop()
-            self._started = False
+        with self._start_lock:
+            future, self._start_future = self._start_future, None
+            if future is not None and future.exception() is None:
+                self._started = True  # Preloaded but never used — still needs stopping
+            if self._started:
+                self._client.stop()
+                self._started = False
 
 
-@dataclass
+@dataclass(slots=True)
 class RunConfig:
     """Configuration for a single generation run.
 
     Each run gets its own RunConfig with its own provider instance.
     Thread-safe: no shared mutable state between runs.
+    Slotted (no per-instance __dict__); not frozen since _provider is set lazily.
     """
     provider_type: str = "api"  # "api" or "pi"
     model: str | None = None
@@ -120,8 +246,14 @@ class RunConfig:
         if self._provider is None:
             if self.provider_type == "pi":
                 self._provider = PiProvider()
+                # Boot Pi while the caller is still setting up the run
+                self._provider.preload()
             else:
                 self._provider = ApiProvider(model=self.model, api_key=self.api_key)
+                if semantic_cache_enabled():
+                    self._provider = SemanticCacheProvider(
+                        self._provider, namespace=self.model or get_model()
+                    )
         return self._provider
 
     def stop(self) -> None:
@@ -131,31 +263,35 @@ class RunConfig:
             self._provider = None
 
 
-# ── Global convenience API (for CLI / single-threaded use) ──────────
+# ── Context-scoped convenience API (for CLI) ────────────────────────
+#
+# The "current" config lives in a ContextVar rather than a module global, so
+# each thread / asyncio task that sets one gets its own. Threads started via
+# asyncio.to_thread or contextvars.copy_context() see the caller's config.
 
-_current_config: RunConfig | None = None
+_current_config: ContextVar[RunConfig | None] = ContextVar("specforge_run_config", default=None)
 
 
 def set_provider_type(provider_type: str) -> None:
-    """Set which provider to use (global, for CLI)."""
-    global _current_config
-    _current_config = RunConfig(provider_type=provider_type)
+    """Set which provider to use for the current context (CLI)."""
+    _current_config.set(RunConfig(provider_type=provider_type))
 
 
 def get_provider() -> LlmProvider:
-    """Get the current LLM provider (global, for CLI).
+    """Get the LLM provider for the current context (CLI).
 
-    For thread-safe usage, use RunConfig.get_provider() instead.
+    For explicit per-run usage, use RunConfig.get_provider() instead.
     """
-    global _current_config
-    if _current_config is None:
-        _current_config = RunConfig()
-    return _current_config.get_provider()
+    config = _current_config.get()
+    if config is None:
+        config = RunConfig()
+        _current_config.set(config)
+    return config.get_provider()
 
 
 def stop_provider() -> None:
-    """Stop and clean up the current provider (global, for CLI)."""
-    global _current_config
-    if _current_config is not None:
-        _current_config.stop()
-        _current_config = None
+    """Stop and clean up the provider for the current context (CLI)."""
+    config = _current_config.get()
+    if config is not None:
+        config.stop()
+        _current_config.set(None)
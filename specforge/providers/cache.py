@@ -0,0 +1,124 @@
+"""On-disk response cache for API provider calls.
+
+Identical (model, temperature, system, user, schema) requests are answered
+from a local SQLite file instead of re-hitting the LLM API. Useful when
+re-running the same spec while developing prompts or tests.
+
+Opt-in via SPECFORGE_LLM_CACHE=1. Generation is non-deterministic, so an
+always-on cache would replay a bad result when the user simply re-runs.
+
+Env vars:
+- SPECFORGE_LLM_CACHE: "1" to enable (default: disabled)
+- SPECFORGE_LLM_CACHE_TTL: entry lifetime in seconds (default: 7 days)
+- SPECFORGE_CACHE_DIR: cache directory (default: ~/.cache/specforge)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+def _get_cache_dir() -> Path:
+    """Get the SpecForge cache directory from env or default."""
+    custom = os.environ.get("SPECFORGE_CACHE_DIR")
+    if custom:
+        return Path(custom)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "specforge"
+
+
+def _get_cache_ttl() -> int:
+    """Get cache entry TTL (seconds) from env or default."""
+    return int(os.environ.get("SPECFORGE_LLM_CACHE_TTL", str(DEFAULT_TTL)))
+
+
+def cache_enabled() -> bool:
+    """Whether the LLM response cache is switched on."""
+    return os.environ.get("SPECFORGE_LLM_CACHE", "0") == "1"
+
+
+def make_key(
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    user_prompt: str,
+    schema_class: type | None = None,
+) -> str:
+    """Build a deterministic cache key for one LLM request."""
+    payload = {
+        "m": model,
+        "t": temperature,
+        "s": system_prompt,
+        "u": user_prompt,
+        "cls": schema_class.__name__ if schema_class else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed key -> response text store with a TTL."""
+
+    def __init__(self, path: str | Path, ttl: int = DEFAULT_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, ts FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, ts = row
+            if time.time() - ts > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response under key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: LLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Get the shared LLM cache, or None when caching is disabled."""
+    global _cache
+    if not cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(_get_cache_dir() / "llm.sqlite", ttl=_get_cache_ttl())
+        return _cache
@@ -6,19 +6,85 @@ over stdin/stdout. Uses the user's existing Claude/Max plan auth.
 
 from __future__ import annotations
 
-import json
+import functools
 import os
 import platform
+import queue
 import subprocess
 import threading
-import time
-from queue import Empty, Queue
 
+from specforge.utils import fastjson
 from specforge.utils.console import console
 
+# Event types that show Pi is up and reading commands
+_READY_EVENT_TYPES = frozenset({"ready", "initialized", "agent_start"})
+
+# How long start() waits for a ready event before assuming Pi is up.
+# Commands written earlier are buffered in the stdin pipe, so there's no
+# need to wait for Pi to finish booting — only to catch an immediate crash.
+_STARTUP_GRACE = 0.2
+
+# Fixed framing around a prompt command — only the message needs encoding
+_PROMPT_PREFIX = b'{"type":"prompt","message":'
+_PROMPT_SUFFIX = b'}\n'
+
+# message_update events that aren't text deltas (thinking, tool calls, ...)
+# are the bulk of Pi's stream and are ignored — recognise them without parsing
+_MESSAGE_UPDATE_PREFIX = b'{"type":"message_update"'
+_TEXT_DELTA_MARKER = b'"text_delta"'
+
+
+class _ReaderPool:
+    """Daemon worker threads for Pi event readers, reused across sessions.
+
+    Grows by one thread whenever no worker is idle, so a reader never waits
+    behind another client's (long-lived) reader. concurrent.futures is not
+    used because its workers are joined at interpreter exit, which would hang
+    on a Pi process that was never stopped.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._spawned = 0
+
+    def submit(self, fn, *args) -> threading.Event:
+        """Run fn(*args) on a pooled thread. The returned event is set when it returns."""
+        done = threading.Event()
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            else:
+                self._spawned += 1
+                threading.Thread(
+                    target=self._worker, name=f"{self._name}-{self._spawned}", daemon=True
+                ).start()
+        self._tasks.put((fn, args, done))
+        return done
+
+    def _worker(self) -> None:
+        while True:
+            fn, args, done = self._tasks.get()
+            try:
+                fn(*args)
+            finally:
+                with self._lock:
+                    self._idle += 1
+                done.set()
+
+
+_READER_POOL = _ReaderPool("pi-reader")
 
+
+@functools.lru_cache(maxsize=1)
 def _find_pi_command() -> str:
-    """Find the Pi executable path."""
+    """Find the Pi executable path.
+
+    Cached for the life of the process — the install location doesn't move.
+    A FileNotFoundError is not cached, so installing Pi mid-session still works.
+    """
     system = platform.system()
 
     if system == "Windows":
@@ -40,16 +106,32 @@ def _find_pi_command() -> str:
     )
 
 
+def reset_pi_command_cache() -> None:
+    """Forget the cached Pi path (e.g. after changing PATH in tests)."""
+    _find_pi_command.cache_clear()
+
+
 class PiRpcClient:
-    """Client for Pi's RPC mode subprocess."""
+    """Client for Pi's RPC mode subprocess.
+
+    The reader thread consumes Pi's event stream and accumulates the reply
+    to the in-flight prompt; prompt() just waits for the completion signal.
+    """
 
     def __init__(self, timeout: int = 300):
         self.proc: subprocess.Popen | None = None
-        self.events: Queue = Queue()
         self.timeout = timeout
-        self._reader_thread: threading.Thread | None = None
+        self._reader_done: threading.Event | None = None
+        self._ready = threading.Event()
         self._pi_cmd: str = ""
 
+        # Per-prompt state, written by the reader thread
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._chunks: list[str] = []
+        self._error: str | None = None
+        self._active = False
+
     def start(self) -> None:
         """Start Pi in RPC mode."""
         self._pi_cmd = _find_pi_command()
@@ -60,39 +142,84 @@ class PiRpcClient:
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            bufsize=1,
         )
 
-        # Background thread to read events
-        self._reader_thread = threading.Thread(target=self._read_events, daemon=True)
-        self._reader_thread.start()
-
-        # Wait for Pi to initialize
-        time.sleep(2)
+        # Read events on a pooled background thread
+        self._ready.clear()
+        self._reader_done = _READER_POOL.submit(self._read_events, self.proc)
+
+        # Wait briefly for a ready event; otherwise just make sure Pi didn't die
+        if not self._ready.wait(timeout=_STARTUP_GRACE) and self.proc.poll() is not None:
+            stderr = self.proc.stderr.read() if self.proc.stderr else b""
+            raise RuntimeError(
+                f"Pi RPC failed to start (exit code {self.proc.returncode}): "
+                f"{stderr.decode('utf-8', errors='replace').strip()}"
+            )
         console.print("  [info]Pi RPC ready[/info]")
 
-    def _read_events(self) -> None:
-        """Read JSON events from Pi's stdout."""
-        if not self.proc or not self.proc.stdout:
+    def _read_events(self, proc: subprocess.Popen) -> None:
+        """Read JSON events from Pi's stdout (raw bytes, one JSON object per line)."""
+        if not proc.stdout:
             return
-        for line in self.proc.stdout:
+        for line in proc.stdout:
             line = line.strip()
-            if not line:
+            if not line.startswith(b"{"):
+                continue  # Blank or non-JSON-object line
+            if line.startswith(_MESSAGE_UPDATE_PREFIX) and _TEXT_DELTA_MARKER not in line:
                 continue
             try:
-                event = json.loads(line)
-                self.events.put(event)
-            except json.JSONDecodeError:
-                pass  # Skip non-JSON lines
-
-    def _send(self, command: dict) -> None:
-        """Send a JSON command to Pi."""
+                event = fastjson.loads(line)
+            except ValueError:
+                continue  # Skip non-JSON (or non-UTF-8) lines
+            if not isinstance(event, dict):
+                continue
+            self._handle_event(event)
+
+        # stdout closed — Pi exited. Fail any in-flight prompt right away.
+        try:
+            returncode = proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            returncode = None
+        self._finish(error=f"Pi process exited with code {returncode}")
+
+    def _handle_event(self, event: dict) -> None:
+        """Apply one Pi event to the in-flight prompt."""
+        event_type = event.get("type")
+
+        if event_type in _READY_EVENT_TYPES:
+            self._ready.set()
+
+        if event_type == "message_update":
+            delta = event.get("assistantMessageEvent", {})
+            if delta.get("type") == "text_delta" and self._active:
+                # Lock-free hot path: single writer, and list.append is atomic
+                self._chunks.append(delta["delta"])
+
+        elif event_type == "agent_end":
+            self._finish()
+
+        elif event_type == "response" and not event.get("success", True):
+            error = event.get("error", "Unknown error")
+            self._finish(error=f"Pi RPC error: {error}")
+
+    def _finish(self, error: str | None = None) -> None:
+        """Mark the in-flight prompt as complete (or failed) and wake prompt()."""
+        with self._lock:
+            if not self._active:
+                return
+            self._active = False
+            self._error = error
+        self._done.set()
+
+    def _send_prompt(self, message: str) -> None:
+        """Send a prompt command, encoding only the message itself."""
+        self._write(_PROMPT_PREFIX + fastjson.dumps(message) + _PROMPT_SUFFIX)
+
+    def _write(self, data: bytes) -> None:
+        """The one write path to Pi's stdin. data must be a complete JSON line."""
         if not self.proc or not self.proc.stdin:
             raise RuntimeError("Pi RPC not started")
-        self.proc.stdin.write(json.dumps(command) + "\n")
+        self.proc.stdin.write(data)
         self.proc.stdin.flush()
 
     def prompt(self, message: str, timeout: int | None = None) -> str:
@@ -107,54 +234,44 @@ class PiRpcClient:
         """
         if not self.proc:
             raise RuntimeError("Pi RPC not started. Call start() first.")
+        if self.proc.poll() is not None:
+            raise RuntimeError(f"Pi process exited with code {self.proc.returncode}")
 
         timeout = timeout or self.timeout
 
-        # Drain any leftover events
-        while not self.events.empty():
-            try:
-                self.events.get_nowait()
-            except Empty:
-                break
-
-        self._send({"type": "prompt", "message": message})
-
-        # Collect response text
-        full_text = ""
-        start = time.time()
-
-        while time.time() - start < timeout:
-            try:
-                event = self.events.get(timeout=2)
-            except Empty:
-                # Check if process is still alive
-                if self.proc.poll() is not None:
-                    raise RuntimeError(f"Pi process exited with code {self.proc.returncode}")
-                continue
-
-            event_type = event.get("type")
-
-            if event_type == "message_update":
-                delta = event.get("assistantMessageEvent", {})
-                if delta.get("type") == "text_delta":
-                    full_text += delta["delta"]
+        with self._lock:
+            self._chunks = []
+            self._error = None
+            self._active = True
+            self._done.clear()
 
-            elif event_type == "agent_end":
-                return full_text
+        self._send_prompt(message)
 
-            elif event_type == "response" and not event.get("success", True):
-                error = event.get("error", "Unknown error")
-                raise RuntimeError(f"Pi RPC error: {error}")
+        if not self._done.wait(timeout):
+            with self._lock:
+                self._active = False
+            raise TimeoutError(f"Pi RPC timed out after {timeout}s")
 
-        raise TimeoutError(f"Pi RPC timed out after {timeout}s")
+        with self._lock:
+            if self._error is not None:
+                raise RuntimeError(self._error)
+            # Joined once at the end — avoids quadratic +=
+            return "".join(self._chunks)
 
     def stop(self) -> None:
         """Stop the Pi subprocess."""
         if self.proc:
             try:
+                # Closing stdin lets Pi exit on its own; terminate covers the rest
+                if self.proc.stdin:
+                    self.proc.stdin.close()
                 self.proc.terminate()
                 self.proc.wait(timeout=5)
             except (subprocess.TimeoutExpired, OSError):
                 self.proc.kill()
             self.proc = None
+            # Hand the reader thread back to the pool before the next start()
+            if self._reader_done is not None:
+                self._reader_done.wait(timeout=1)
+                self._reader_done = None
             console.print("  [info]Pi RPC stopped[/info]")
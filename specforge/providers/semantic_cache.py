@@ -0,0 +1,230 @@
+"""Semantic (near-duplicate) response cache for LLM providers.
+
+The self-correcting loop re-prompts the Coder and Tester with the same
+instructions but slightly different error text, which never hits the
+exact-match cache in cache.py. This cache answers such a prompt from an
+earlier response when the error text is close enough.
+
+Only the varying section of a prompt (the errors or pytest output) is
+embedded. Everything else — the system prompt and the rest of the user
+prompt — must match exactly, so prompts that merely share a long prefix
+(every Coder batch starts with the same system design) never answer for each
+other. Prompts without a recognised varying section bypass this cache.
+
+Opt-in via SPECFORGE_SEMANTIC_CACHE=1 and needs the `semantic` extra
+(pip install specforge[semantic]). A fuzzy hit can replay an answer written
+for a slightly different error, so keep the threshold high.
+
+A run never hits its own entries: within one run, a near-identical error
+means the previous fix didn't work, and replaying it would stall the repair
+loop. Entries only answer for later runs.
+
+Env vars:
+- SPECFORGE_SEMANTIC_CACHE: "1" to enable (default: disabled)
+- SPECFORGE_SEMANTIC_CACHE_THRESHOLD: min cosine similarity for a hit (default: 0.95)
+- SPECFORGE_CACHE_DIR: cache directory (default: ~/.cache/specforge)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import re
+import secrets
+import threading
+from pathlib import Path
+from typing import Callable
+
+from specforge.providers.cache import _get_cache_dir
+from specforge.utils import fastjson
+
+DEFAULT_THRESHOLD = 0.95
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# The part of a user prompt that changes between repair iterations. Each
+# pattern's first group is embedded; the rest of the prompt is matched exactly.
+_VARYING_SECTIONS = [
+    # Coder repair batches (coder._build_batch_prompt)
+    re.compile(r"ERRORS FROM PREVIOUS RUN:\n(.*?)\n\nFix ALL issues from previous errors above\.", re.DOTALL),
+    # Tester failure analysis (prompts/tester.ANALYSIS_PROMPT)
+    re.compile(r"## Pytest Output\n\n(.*?)\n\n## Generated Files", re.DOTALL),
+]
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def semantic_cache_enabled() -> bool:
+    """Whether the semantic cache is switched on."""
+    return os.environ.get("SPECFORGE_SEMANTIC_CACHE", "0") == "1"
+
+
+def _get_threshold() -> float:
+    """Get the similarity threshold from env or default."""
+    return float(os.environ.get("SPECFORGE_SEMANTIC_CACHE_THRESHOLD", str(DEFAULT_THRESHOLD)))
+
+
+def _default_encoder() -> Callable[[str], list[float]]:
+    """Load the embedding model once per process."""
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise RuntimeError(
+                    "Semantic cache needs sentence-transformers.\n"
+                    "Install with: pip install specforge[semantic]"
+                )
+            model = SentenceTransformer(EMBEDDING_MODEL)
+            _encoder = lambda text: model.encode(text, normalize_embeddings=True)  # noqa: E731
+        return _encoder
+
+
+def split_prompt(system_prompt: str, user_prompt: str) -> tuple[str, str] | None:
+    """Split a prompt into (exact key, varying text).
+
+    The key hashes the system prompt and the user prompt with its varying
+    section cut out. Returns None when the prompt has no varying section.
+    """
+    for pattern in _VARYING_SECTIONS:
+        match = pattern.search(user_prompt)
+        if match:
+            start, end = match.span(1)
+            fixed = user_prompt[:start] + "\0" + user_prompt[end:]
+            digest = hashlib.sha256()
+            for part in (system_prompt, fixed):
+                digest.update(part.encode("utf-8"))
+                digest.update(b"\0")
+            return digest.hexdigest(), match.group(1)
+    return None
+
+
+def _normalize(vector) -> list[float]:
+    values = [float(x) for x in vector]
+    norm = math.sqrt(sum(x * x for x in values)) or 1.0
+    return [x / norm for x in values]
+
+
+class SemanticCacheProvider:
+    """LlmProvider wrapper that reuses responses for near-identical prompts.
+
+    Only plain-text invoke() calls go through the cache; structured calls are
+    delegated unchanged since a near-miss there would skip schema validation.
+
+    Entries live in an append-only entries.jsonl, one {key, embedding,
+    response, run} object per line, so a store never rewrites earlier entries.
+    Each instance is one run (RunConfig builds a provider per run) and skips
+    entries tagged with its own run id.
+    Lookups compare against the few entries sharing the exact key, so a
+    linear scan is enough.
+    """
+
+    def __init__(
+        self,
+        provider,
+        namespace: str = "default",
+        cache_dir: str | Path | None = None,
+        threshold: float | None = None,
+        encoder: Callable[[str], list[float]] | None = None,
+    ):
+        self._provider = provider
+        self.threshold = _get_threshold() if threshold is None else threshold
+        # One cache per model — answers from another model aren't interchangeable
+        digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        self.path = Path(cache_dir) if cache_dir else _get_cache_dir() / "semantic" / digest
+        self._encoder = encoder
+        self._run_id = secrets.token_hex(8)
+        # exact key -> [(embedding, response, run id), ...]
+        self._entries: dict[str, list[tuple[list[float], str, str]]] | None = None
+        self._lock = threading.Lock()
+
+    def invoke(self, system_prompt: str, user_prompt: str) -> str:
+        split = split_prompt(system_prompt, user_prompt)
+        if split is None:
+            return self._provider.invoke(system_prompt, user_prompt)
+        key, varying = split
+        embedding = self._embed(varying)
+        cached = self._lookup(key, embedding)
+        if cached is not None:
+            return cached
+        response = self._provider.invoke(system_prompt, user_prompt)
+        self._store(key, embedding, response)
+        return response
+
+    def invoke_many(self, prompts: list[tuple[str, str]]) -> list[str]:
+        lookups: list[tuple[str, list[float]] | None] = []
+        results: list[str | None] = []
+        for system_prompt, user_prompt in prompts:
+            split = split_prompt(system_prompt, user_prompt)
+            if split is None:
+                lookups.append(None)
+                results.append(None)
+                continue
+            key, varying = split
+            embedding = self._embed(varying)
+            lookups.append((key, embedding))
+            results.append(self._lookup(key, embedding))
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if pending:
+            responses = self._provider.invoke_many([prompts[i] for i in pending])
+            for i, response in zip(pending, responses):
+                results[i] = response
+                if lookups[i] is not None:
+                    self._store(*lookups[i], response)
+        return results
+
+    def invoke_structured(self, system_prompt: str, user_prompt: str, schema_class):
+        return self._provider.invoke_structured(system_prompt, user_prompt, schema_class)
+
+    def stop(self) -> None:
+        self._provider.stop()
+
+    def _embed(self, text: str) -> list[float]:
+        if self._encoder is None:
+            self._encoder = _default_encoder()
+        return _normalize(self._encoder(text))
+
+    def _lookup(self, key: str, embedding: list[float]) -> str | None:
+        with self._lock:
+            best, best_score = None, self.threshold
+            for cached_embedding, response, run_id in self._load().get(key, ()):
+                if run_id == self._run_id:
+                    continue  # Our own earlier answer failed — don't replay it
+                score = sum(a * b for a, b in zip(embedding, cached_embedding))
+                if score >= best_score:
+                    best, best_score = response, score
+            return best
+
+    def _store(self, key: str, embedding: list[float], response) -> None:
+        if not isinstance(response, str) or not response.strip():
+            return
+        entry = {"key": key, "embedding": embedding, "response": response, "run": self._run_id}
+        line = fastjson.dumps(entry) + b"\n"
+        with self._lock:
+            self._load().setdefault(key, []).append((embedding, response, self._run_id))
+            self.path.mkdir(parents=True, exist_ok=True)
+            # One O_APPEND write per entry — concurrent writers can't interleave
+            with open(self.path / "entries.jsonl", "ab") as f:
+                f.write(line)
+
+    def _load(self) -> dict[str, list[tuple[list[float], str, str]]]:
+        """Read entries.jsonl on first use. Caller holds the lock."""
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, list[tuple[list[float], str, str]]] = {}
+        entries_file = self.path / "entries.jsonl"
+        if entries_file.exists():
+            with open(entries_file, "rb") as f:
+                for line in f:
+                    try:
+                        entry = fastjson.loads(line)
+                        entries.setdefault(entry["key"], []).append(
+                            (entry["embedding"], entry["response"], entry.get("run", ""))
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn write from a crashed run — skip it
+        self._entries = entries
+        return entries
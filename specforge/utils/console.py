@@ -3,7 +3,7 @@
 import io
 import sys
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
@@ -52,8 +52,19 @@ def print_agent_error(agent_name: str, message: str) -> None:
     console.print(f"  [error][FAIL] {agent_name}:[/error] {message}")
 
 
-def print_test_results(passed: int, failed: int, errors: int, total: int) -> None:
-    """Print test results as a table."""
+def print_agent_phase(agent_name: str, message: str, table: Table | None = None) -> None:
+    """Print an agent's success line (and optional table) as one render.
+
+    One console.print for the whole block avoids re-rendering and flushing
+    per line, so the table and status line appear together.
+    """
+    line = f"  [success][OK] {agent_name}:[/success] {message}"
+    parts: list[RenderableType] = [table, line] if table is not None else [line]
+    console.print(Group(*parts))
+
+
+def build_test_results_table(passed: int, failed: int, errors: int, total: int) -> Table:
+    """Build the test results table."""
     table = Table(title="Test Results", border_style="cyan")
     table.add_column("Metric", style="bold")
     table.add_column("Value", justify="right")
@@ -62,8 +73,12 @@ def print_test_results(passed: int, failed: int, errors: int, total: int) -> Non
     table.add_row("Passed", f"[green]{passed}[/green]")
     table.add_row("Failed", f"[red]{failed}[/red]" if failed else f"[green]{failed}[/green]")
     table.add_row("Errors", f"[red]{errors}[/red]" if errors else f"[green]{errors}[/green]")
+    return table
+
 
-    console.print(table)
+def print_test_results(passed: int, failed: int, errors: int, total: int) -> None:
+    """Print test results as a table."""
+    console.print(build_test_results_table(passed, failed, errors, total))
 
 
 def print_success(output_dir: str) -> None:
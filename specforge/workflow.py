@@ -11,24 +11,29 @@ from specforge.models import AgentState
 from specforge.utils.console import console
 
 
+# Statuses that end the run regardless of iteration count
+_TERMINAL_STATUSES = frozenset({"error", "success"})
+
+_TERMINAL_MESSAGES = {
+    "error": "\n[error]Stopping due to error[/error]",
+    "success": "\n[success]Tests passed - generation complete![/success]",
+}
+
+
 def _should_continue(state: AgentState) -> str:
     """Decide whether to loop back to Coder or finish.
 
     Returns the next node name or END.
     """
     status = state.get("status", "in_progress")
-    iteration = state.get("iteration", 1)
-    max_iterations = state.get("max_iterations", 4)
 
-    # If we hit an error status, stop
-    if status == "error":
-        console.print("\n[error]Stopping due to error[/error]")
+    # Error or tests passed — we're done
+    if status in _TERMINAL_STATUSES:
+        console.print(_TERMINAL_MESSAGES[status])
         return END
 
-    # If tests passed, we're done
-    if status == "success":
-        console.print("\n[success]Tests passed - generation complete![/success]")
-        return END
+    iteration = state.get("iteration", 1)
+    max_iterations = state.get("max_iterations", 4)
 
     # If we've exceeded max iterations, stop
     if iteration > max_iterations:
@@ -48,7 +53,8 @@ def _should_continue(state: AgentState) -> str:
 
 def _after_architect(state: AgentState) -> str:
     """Check if architect succeeded before proceeding to coder."""
-    if state.get("status") == "error":
+    # Architect never reports "success", so only "error" can end the run here
+    if state.get("status") in _TERMINAL_STATUSES:
         console.print("\n[error]Stopping: Architect failed[/error]")
         return END
     return "coder"
@@ -54,3 +54,14 @@ class TestParseFilesResponse:
         content = '{"app/main.py": "code"}\n\nAll files are now fixed.'
         result = _parse_files_response(content)
         assert result == {"app/main.py": "code"}
+
+    def test_nested_braces_in_fence(self):
+        """Fenced JSON whose file contents contain braces and closing fences."""
+        content = (
+            "Here you go:\n"
+            '```json\n{"app/main.py": "d = {\\"a\\": {\\"b\\": 1}}", '
+            '"README.md": "```bash\\nmake\\n```"}\n```\nDone.'
+        )
+        result = _parse_files_response(content)
+        assert result["app/main.py"] == 'd = {"a": {"b": 1}}'
+        assert result["README.md"] == "```bash\nmake\n```"
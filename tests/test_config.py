@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
-from specforge.config import get_model, set_model, validate_api_key
+from specforge.config import _detect_provider, get_model, set_model, validate_api_key
 
 
 class TestModelConfig:
@@ -24,6 +24,21 @@ class TestModelConfig:
         assert get_model() == "gpt-4o-mini"
 
 
+class TestDetectProvider:
+    @pytest.mark.parametrize("model,expected", [
+        ("gpt-4o", "openai"),
+        ("claude-sonnet-4-20250514", "anthropic"),
+        ("claude3", "anthropic"),
+        ("kimi-k2.5", "moonshot"),
+        ("moonshot-v1-8k", "moonshot"),
+        ("deepseek-chat", "deepseek"),
+        ("moonshotai/Kimi-K2.5", "openrouter"),
+        ("anthropic/claude-sonnet-4", "openrouter"),
+    ])
+    def test_detect_provider(self, model, expected):
+        assert _detect_provider(model) == expected
+
+
 class TestApiKeyValidation:
     def setup_method(self):
         set_model("gpt-4o")
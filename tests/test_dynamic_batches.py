@@ -6,6 +6,7 @@ from specforge.agents.coder import (
     _build_batch_system_prompt,
     _build_dynamic_batches,
     _extract_endpoint_groups,
+    _generate_in_batches,
     _has_auth_endpoints,
 )
 
@@ -87,39 +88,20 @@ class TestExtractEndpointGroups:
         assert "root" in groups
 
 
-class TestBuildDynamicBatches:
-    def test_todo_app(self):
-        """SystemDesign with /tasks/* endpoints → generates routers/tasks.py, test_tasks.py"""
-        design = _make_design(
+def _batch_designs() -> dict[str, dict]:
+    """The SystemDesigns exercised by TestBuildDynamicBatches, by name."""
+    return {
+        # /tasks/* endpoints → routers/tasks.py, test_tasks.py
+        "todo": _make_design(
             endpoints=[
                 _make_endpoint("/tasks", "POST", tags=["tasks"], summary="Create task"),
                 _make_endpoint("/tasks", "GET", tags=["tasks"], summary="List tasks"),
                 _make_endpoint("/tasks/{id}", "DELETE", tags=["tasks"], summary="Delete task"),
             ],
             database_models=[_make_model("Task", "tasks")],
-        )
-        batches = _build_dynamic_batches(design)
-
-        assert len(batches) == 4
-        assert batches[0]["name"] == "core"
-        assert batches[1]["name"] == "routers"
-        assert batches[2]["name"] == "tests"
-        assert batches[3]["name"] == "infra"
-
-        # Router batch should mention tasks.py
-        assert "routers/tasks.py" in batches[1]["instruction"]
-        # Should NOT mention links.py or admin.py (old hardcoded names)
-        assert "links.py" not in batches[1]["instruction"]
-        assert "admin.py" not in batches[1]["instruction"]
-
-        # Test batch should mention test_tasks.py
-        assert "test_tasks.py" in batches[2]["instruction"]
-        # Always has test_health.py
-        assert "test_health.py" in batches[2]["instruction"]
-
-    def test_multi_router(self):
-        """SystemDesign with multiple endpoint groups → multiple routers and test files."""
-        design = _make_design(
+        ),
+        # Multiple endpoint groups → multiple routers and test files
+        "multi": _make_design(
             endpoints=[
                 _make_endpoint("/users", "POST", tags=["users"]),
                 _make_endpoint("/users/{id}", "GET", tags=["users"]),
@@ -127,83 +109,109 @@ class TestBuildDynamicBatches:
                 _make_endpoint("/products/{id}", "GET", tags=["products"]),
                 _make_endpoint("/orders", "POST", tags=["orders"]),
             ],
-        )
-        batches = _build_dynamic_batches(design)
-
-        router_instruction = batches[1]["instruction"]
-        assert "routers/users.py" in router_instruction
-        assert "routers/products.py" in router_instruction
-        assert "routers/orders.py" in router_instruction
-
-        test_instruction = batches[2]["instruction"]
-        assert "test_users.py" in test_instruction
-        assert "test_products.py" in test_instruction
-        assert "test_orders.py" in test_instruction
-
-    def test_with_auth(self):
-        """Endpoints with auth_required → includes app/auth.py."""
-        design = _make_design(
+        ),
+        "auth": _make_design(
             endpoints=[
                 _make_endpoint("/tasks", "POST", tags=["tasks"], auth="jwt"),
                 _make_endpoint("/health", "GET", tags=["health"]),
             ],
-        )
-        batches = _build_dynamic_batches(design)
-
-        core_instruction = batches[0]["instruction"]
-        assert "app/auth.py" in core_instruction
-
-    def test_no_auth(self):
-        """No auth endpoints → no app/auth.py in core batch."""
-        design = _make_design(
+        ),
+        "no_auth": _make_design(
             endpoints=[
                 _make_endpoint("/tasks", "GET", tags=["tasks"]),
                 _make_endpoint("/health", "GET", tags=["health"]),
             ],
-        )
-        batches = _build_dynamic_batches(design)
-
-        core_instruction = batches[0]["instruction"]
-        assert "app/auth.py" not in core_instruction
-
-    def test_always_has_health(self):
-        """Health test file is always included even without explicit health endpoint."""
-        design = _make_design(
+        ),
+        "no_health": _make_design(
             endpoints=[
                 _make_endpoint("/tasks", "GET", tags=["tasks"]),
             ],
-        )
-        batches = _build_dynamic_batches(design)
-
-        # Router batch should add a health router
-        assert "health" in batches[1]["instruction"].lower()
-        # Test batch always has test_health.py
-        assert "test_health.py" in batches[2]["instruction"]
-
-    def test_core_batch_lists_models(self):
-        """Core batch instruction should describe the actual database models."""
-        design = _make_design(
+        ),
+        "models": _make_design(
             database_models=[
                 _make_model("Task", "tasks", [{"name": "id"}, {"name": "title"}, {"name": "done"}]),
                 _make_model("User", "users", [{"name": "id"}, {"name": "email"}]),
             ],
-        )
-        batches = _build_dynamic_batches(design)
+        ),
+        "deps": _make_design(
+            dependencies=["fastapi", "uvicorn", "sqlmodel", "redis"],
+        ),
+    }
 
-        core_instruction = batches[0]["instruction"]
-        assert "Task" in core_instruction
-        assert "User" in core_instruction
 
-    def test_infra_batch_uses_dependencies(self):
-        """Infra batch should list actual dependencies from SystemDesign."""
-        design = _make_design(
-            dependencies=["fastapi", "uvicorn", "sqlmodel", "redis"],
-        )
-        batches = _build_dynamic_batches(design)
+@pytest.fixture(scope="module")
+def built():
+    """Batches for each design in _batch_designs(), built once per module."""
+    return {name: _build_dynamic_batches(design) for name, design in _batch_designs().items()}
+
+
+# (design, batch index, must appear in instruction, must not appear)
+_BATCH_CASES = [
+    # Router/test files follow the endpoint groups, not old hardcoded names
+    pytest.param("todo", 1, ["routers/tasks.py"], ["links.py", "admin.py"], id="todo-routers"),
+    pytest.param("todo", 2, ["test_tasks.py", "test_health.py"], [], id="todo-tests"),
+    pytest.param(
+        "multi", 1, ["routers/users.py", "routers/products.py", "routers/orders.py"], [],
+        id="multi-routers",
+    ),
+    pytest.param(
+        "multi", 2, ["test_users.py", "test_products.py", "test_orders.py"], [],
+        id="multi-tests",
+    ),
+    # Core includes app/auth.py only when some endpoint needs auth
+    pytest.param("auth", 0, ["app/auth.py"], [], id="with-auth"),
+    pytest.param("no_auth", 0, [], ["app/auth.py"], id="no-auth"),
+    # Health router + test are always added, even without a /health endpoint
+    pytest.param("no_health", 1, ["health"], [], id="health-router"),
+    pytest.param("no_health", 2, ["test_health.py"], [], id="health-test"),
+    # Core describes the actual models; infra lists the actual dependencies
+    pytest.param("models", 0, ["Task", "User"], [], id="core-models"),
+    pytest.param("deps", 3, ["fastapi", "redis"], [], id="infra-deps"),
+]
+
 
-        infra_instruction = batches[3]["instruction"]
-        assert "fastapi" in infra_instruction
-        assert "redis" in infra_instruction
+class TestBuildDynamicBatches:
+    def test_batch_order(self, built):
+        assert [b["name"] for b in built["todo"]] == ["core", "routers", "tests", "infra"]
+
+    @pytest.mark.parametrize("design, index, present, absent", _BATCH_CASES)
+    def test_batch_instruction(self, built, design, index, present, absent):
+        instruction = built[design][index]["instruction"]
+        # One assertion per direction, reporting every offending substring at once
+        assert [text for text in present if text not in instruction] == []
+        assert [text for text in absent if text in instruction] == []
+
+
+class TestBatchStages:
+    def test_tests_and_infra_share_a_stage(self):
+        batches = _build_dynamic_batches(_make_design())
+        stages = {b["name"]: b["stage"] for b in batches}
+        assert stages["core"] < stages["routers"] < stages["tests"]
+        assert stages["tests"] == stages["infra"]
+
+    def test_same_stage_batches_sent_together(self):
+        """Independent batches go through one invoke_many call."""
+
+        class FakeProvider:
+            def __init__(self):
+                self.single = 0
+                self.many: list[int] = []
+
+            def invoke(self, system_prompt, user_prompt):
+                self.single += 1
+                return '{"app/file%d.py": "x"}' % self.single
+
+            def invoke_many(self, prompts):
+                self.many.append(len(prompts))
+                return ['{"tests/test_x.py": "x"}', '{"requirements.txt": "fastapi"}']
+
+        provider = FakeProvider()
+        files = _generate_in_batches(_make_design(), provider=provider)
+
+        assert provider.single == 2  # core, routers
+        assert provider.many == [2]  # tests + infra
+        assert "tests/test_x.py" in files
+        assert "requirements.txt" in files
 
 
 # ── P0-B: Prompt generation tests ──────────────────────────────────
@@ -2,6 +2,7 @@
 
 import pytest
 
+from specforge import events
 from specforge.events import (
     ProgressEvent,
     add_handler,
@@ -12,11 +13,9 @@ from specforge.events import (
 
 
 @pytest.fixture(autouse=True)
-def cleanup_handlers():
-    """Ensure handlers are cleared between tests."""
-    clear_handlers()
-    yield
-    clear_handlers()
+def isolated_handlers(monkeypatch):
+    """Give each test its own handler list instead of sharing the global one."""
+    monkeypatch.setattr(events, "_handlers", [])
 
 
 class TestProgressEvent:
@@ -39,6 +38,13 @@ class TestProgressEvent:
         assert d["iteration"] == 2
         assert d["data"]["files"] == 7
 
+    def test_json_bytes_encoded_once(self):
+        from specforge.utils import fastjson
+
+        ev = ProgressEvent(agent="tester", event="done", message="Tests passed ✓", data={"total": 3})
+        assert fastjson.loads(ev.json_bytes) == ev.to_dict()
+        assert ev.json_bytes is ev.json_bytes
+
 
 class TestHandlers:
     def test_add_and_emit(self):
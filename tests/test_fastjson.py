@@ -0,0 +1,29 @@
+"""Tests for the orjson/stdlib JSON helpers."""
+
+import pytest
+
+from specforge.utils import fastjson
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(fastjson, "orjson", None)
+    elif fastjson.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestFastJson:
+    def test_roundtrip(self, backend):
+        obj = {"type": "prompt", "message": "naïve → ✓", "n": [1, 2.5, None, True]}
+        data = fastjson.dumps(obj)
+        assert isinstance(data, bytes)
+        assert fastjson.loads(data) == obj
+
+    def test_loads_str(self, backend):
+        assert fastjson.loads('{"a": 1}') == {"a": 1}
+
+    def test_invalid_raises_value_error(self, backend):
+        with pytest.raises(ValueError):
+            fastjson.loads(b"not json")
@@ -0,0 +1,117 @@
+"""Tests for the on-disk LLM response cache."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from specforge.models import SystemDesign
+from specforge.providers import ApiProvider, cache as llm_cache
+from specforge.providers.cache import LLMCache, make_key
+
+
+@pytest.fixture
+def enabled_cache(tmp_path, monkeypatch):
+    """Enable the cache, pointed at a temp dir, and reset the shared instance."""
+    monkeypatch.setenv("SPECFORGE_LLM_CACHE", "1")
+    monkeypatch.setenv("SPECFORGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    yield
+    if llm_cache._cache is not None:
+        llm_cache._cache.close()
+    monkeypatch.setattr(llm_cache, "_cache", None)
+
+
+class TestLLMCache:
+    def test_get_set(self, tmp_path):
+        cache = LLMCache(tmp_path / "llm.sqlite")
+        assert cache.get("k") is None
+        cache.set("k", "response")
+        assert cache.get("k") == "response"
+        cache.close()
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        cache = LLMCache(tmp_path / "llm.sqlite", ttl=-1)
+        cache.set("k", "response")
+        assert cache.get("k") is None
+        cache.close()
+
+    def test_key_depends_on_every_input(self):
+        base = make_key("gpt-4o", 0.1, "sys", "user")
+        assert base == make_key("gpt-4o", 0.1, "sys", "user")
+        assert base != make_key("gpt-4o-mini", 0.1, "sys", "user")
+        assert base != make_key("gpt-4o", 0.2, "sys", "user")
+        assert base != make_key("gpt-4o", 0.1, "other", "user")
+        assert base != make_key("gpt-4o", 0.1, "sys", "other")
+        assert base != make_key("gpt-4o", 0.1, "sys", "user", SystemDesign)
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("SPECFORGE_LLM_CACHE", raising=False)
+        assert llm_cache.get_llm_cache() is None
+
+
+def _fake_llm(temperature: float = 0.1) -> MagicMock:
+    return MagicMock(temperature=temperature)
+
+
+class TestApiProviderCaching:
+    def test_invoke_hits_cache_on_repeat(self, enabled_cache):
+        provider = ApiProvider(model="gpt-4o", api_key="sk-test")
+        llm = _fake_llm()
+        llm.invoke.return_value = MagicMock(content='{"app/main.py": "x"}')
+        provider._get_llm = MagicMock(return_value=llm)
+
+        first = provider.invoke("sys", "user")
+        second = provider.invoke("sys", "user")
+
+        assert first == second == '{"app/main.py": "x"}'
+        assert llm.invoke.call_count == 1
+
+    def test_empty_response_not_cached(self, enabled_cache):
+        provider = ApiProvider(model="gpt-4o", api_key="sk-test")
+        llm = _fake_llm()
+        llm.invoke.return_value = MagicMock(content="")
+        provider._get_llm = MagicMock(return_value=llm)
+
+        provider.invoke("sys", "user")
+        provider.invoke("sys", "user")
+
+        assert llm.invoke.call_count == 2
+
+    def test_invoke_structured_roundtrips_model(self, enabled_cache):
+        provider = ApiProvider(model="gpt-4o", api_key="sk-test")
+        design = SystemDesign(project_name="cached", description="from cache")
+        structured = MagicMock()
+        structured.invoke.return_value = design
+        llm = _fake_llm()
+        llm.with_structured_output.return_value = structured
+        provider._get_llm = MagicMock(return_value=llm)
+
+        provider.invoke_structured("sys", "user", SystemDesign)
+        result = provider.invoke_structured("sys", "user", SystemDesign)
+
+        assert isinstance(result, SystemDesign)
+        assert result.project_name == "cached"
+        assert structured.invoke.call_count == 1
+
+    def test_key_uses_client_temperature(self, enabled_cache):
+        """get_llm() can override the requested temperature — the key follows the client."""
+        provider = ApiProvider(model="gpt-4o", api_key="sk-test")
+        cold, hot = _fake_llm(0.1), _fake_llm(1.0)
+        for llm in (cold, hot):
+            llm.invoke.return_value = MagicMock(content="answer")
+            provider._get_llm = MagicMock(return_value=llm)
+            provider.invoke("sys", "user")
+
+        assert cold.invoke.call_count == hot.invoke.call_count == 1
+
+    def test_invoke_many_only_sends_misses(self, enabled_cache):
+        provider = ApiProvider(model="gpt-4o", api_key="sk-test")
+        llm = _fake_llm()
+        llm.invoke.return_value = MagicMock(content="one")
+        llm.batch.return_value = [MagicMock(content="two")]
+        provider._get_llm = MagicMock(return_value=llm)
+
+        provider.invoke("sys", "first")
+        assert provider.invoke_many([("sys", "first"), ("sys", "second")]) == ["one", "two"]
+        assert len(llm.batch.call_args.args[0]) == 1
+        assert provider.invoke("sys", "second") == "two"
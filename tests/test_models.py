@@ -1,6 +1,7 @@
 """Tests for SpecForge Pydantic models."""
 
 import pytest
+from pydantic import ValidationError
 
 from specforge.models import (
     AgentState,
@@ -19,6 +20,7 @@ from specforge.models import (
     SystemDesign,
     TestRunResult,
 )
+from specforge.utils import fastjson
 
 
 class TestEndpoint:
@@ -119,10 +121,41 @@ class TestSystemDesign:
             description="test project",
         )
         data = design.model_dump()
-        design2 = SystemDesign.model_validate(data)
+        # Only checks the fields survive — validation is covered below
+        design2 = SystemDesign.model_construct(**data)
         assert design2.project_name == "test"
         assert design2.python_version == "3.12"
 
+    def test_validation_enforced(self):
+        data = SystemDesign(project_name="test", description="test project").model_dump()
+        data["endpoints"] = [{"method": "FETCH", "path": "/x", "summary": "bad method"}]
+        with pytest.raises(ValidationError):
+            SystemDesign.model_validate(data)
+
+    def test_json_roundtrip(self):
+        design = SystemDesign(
+            project_name="test",
+            description="test project",
+            endpoints=[Endpoint(method=HttpMethod.GET, path="/items", summary="List")],
+        )
+        # Parse straight from JSON bytes — no intermediate dict rebuild
+        design2 = SystemDesign.model_validate_json(fastjson.dumps(design.model_dump()))
+        assert design2 == design
+
+    def test_dump_uses_plain_enum_values(self):
+        design = SystemDesign(
+            project_name="test",
+            description="test project",
+            endpoints=[
+                Endpoint(method=HttpMethod.POST, path="/login", summary="Login", auth=AuthType.JWT),
+            ],
+        )
+        ep = design.model_dump()["endpoints"][0]
+        assert type(ep["method"]) is str
+        assert ep["method"] == "POST"
+        assert type(ep["auth"]) is str
+        assert ep["auth"] == "jwt"
+
 
 class TestTestRunResult:
     def test_passing(self):
@@ -0,0 +1,156 @@
+"""Tests for the Pi RPC client against a fake `pi --mode rpc` subprocess."""
+
+import io
+import json
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from specforge.providers import pi_rpc
+from specforge.providers.pi_rpc import PiRpcClient
+
+# Minimal stand-in for Pi's RPC mode: echoes each prompt back as text deltas.
+FAKE_PI = r'''
+import json
+import sys
+
+for line in sys.stdin:
+    cmd = json.loads(line)
+    if cmd.get("type") != "prompt":
+        continue
+    message = cmd["message"]
+    if message == "crash":
+        sys.exit(3)
+    if message == "hang":
+        continue
+    print(json.dumps({"type": "agent_start"}), flush=True)
+    for i in range(0, len(message), 4):
+        print(json.dumps({
+            "type": "message_update",
+            "assistantMessageEvent": {"type": "text_delta", "delta": message[i:i + 4]},
+        }), flush=True)
+    print(json.dumps({"type": "agent_end"}), flush=True)
+'''
+
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Fake Pi uses a shebang script")
+
+
+@pytest.fixture
+def fake_pi(tmp_path, monkeypatch):
+    script = tmp_path / "pi"
+    script.write_text(f"#!{sys.executable}\n{FAKE_PI}")
+    script.chmod(0o755)
+    monkeypatch.setattr(pi_rpc, "_find_pi_command", lambda: str(script))
+    return script
+
+
+@pytest.fixture
+def client(fake_pi):
+    c = PiRpcClient(timeout=10)
+    c.start()
+    yield c
+    c.stop()
+
+
+class TestPiRpcClient:
+    def test_start_does_not_sleep(self, fake_pi):
+        c = PiRpcClient(timeout=10)
+        start = time.monotonic()
+        c.start()
+        try:
+            assert time.monotonic() - start < 1.5
+        finally:
+            c.stop()
+
+    def test_prompt_collects_text(self, client):
+        assert client.prompt("hello from specforge") == "hello from specforge"
+
+    def test_multiple_prompts(self, client):
+        assert client.prompt("first") == "first"
+        assert client.prompt("second prompt") == "second prompt"
+
+    def test_unicode_roundtrip(self, client):
+        assert client.prompt("naïve → ✓ 日本") == "naïve → ✓ 日本"
+
+    def test_process_exit_raises_immediately(self, client):
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="exited"):
+            client.prompt("crash", timeout=30)
+        assert time.monotonic() - start < 5
+
+    def test_timeout(self, client):
+        with pytest.raises(TimeoutError):
+            client.prompt("hang", timeout=0.3)
+        # The client is still usable afterwards
+        assert client.prompt("after") == "after"
+
+    def test_restart_reuses_reader_thread(self, fake_pi):
+        c = PiRpcClient(timeout=10)
+        c.start()
+        assert c.prompt("one") == "one"
+        c.stop()
+        spawned = pi_rpc._READER_POOL._spawned
+
+        c.start()
+        try:
+            assert c.prompt("two") == "two"
+        finally:
+            c.stop()
+        assert pi_rpc._READER_POOL._spawned == spawned
+
+
+class TestSendPrompt:
+    def test_framing_matches_full_encoding(self):
+        c = PiRpcClient()
+        c.proc = MagicMock(stdin=io.BytesIO())
+        message = 'say "hi"\nnaïve ✓'
+        c._send_prompt(message)
+        line = c.proc.stdin.getvalue()
+        assert line.endswith(b"\n")
+        assert json.loads(line) == {"type": "prompt", "message": message}
+
+
+class TestReadEvents:
+    def test_only_relevant_lines_are_parsed(self):
+        c = PiRpcClient()
+        handled = []
+        c._handle_event = handled.append
+        lines = [
+            b"\n",
+            b"Pi v1.0 starting\n",
+            b'{"type":"message_update","assistantMessageEvent":{"type":"thinking_delta","delta":"hm"}}\n',
+            b'{"type":"message_update","assistantMessageEvent":{"type":"text_delta","delta":"hi"}}\n',
+            b'{"type":"agent_end"}\n',
+        ]
+        c._read_events(MagicMock(stdout=lines, **{"wait.return_value": 0}))
+        assert [e["type"] for e in handled] == ["message_update", "agent_end"]
+        assert handled[0]["assistantMessageEvent"]["delta"] == "hi"
+
+
+class TestFindPiCommand:
+    def test_result_is_cached(self, tmp_path, monkeypatch):
+        script = tmp_path / "pi"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", str(tmp_path))
+        pi_rpc.reset_pi_command_cache()
+        try:
+            assert pi_rpc._find_pi_command() == str(script)
+            monkeypatch.setenv("PATH", "")
+            assert pi_rpc._find_pi_command() == str(script)
+        finally:
+            pi_rpc.reset_pi_command_cache()
+
+    def test_missing_pi_is_not_cached(self, monkeypatch):
+        monkeypatch.setenv("PATH", "")
+        pi_rpc.reset_pi_command_cache()
+        try:
+            with pytest.raises(FileNotFoundError):
+                pi_rpc._find_pi_command()
+            assert pi_rpc._find_pi_command.cache_info().currsize == 0
+        finally:
+            pi_rpc.reset_pi_command_cache()
@@ -1,27 +1,53 @@
 """Tests for RunConfig thread-safe provider management."""
 
+from unittest.mock import MagicMock
+
+import pytest
+
 from specforge.providers import ApiProvider, PiProvider, RunConfig
 from specforge import events
 
 
-class TestRunConfig:
-    def test_creates_api_provider(self):
-        config = RunConfig(provider_type="api", model="gpt-4o")
-        provider = config.get_provider()
-        assert isinstance(provider, ApiProvider)
+@pytest.fixture
+def make_api_config():
+    """Factory for api RunConfigs. Every config it makes is stopped on teardown."""
+    configs: list[RunConfig] = []
+
+    def make(**kwargs) -> RunConfig:
+        config = RunConfig(provider_type="api", **kwargs)
+        configs.append(config)
+        return config
+
+    yield make
+    for config in configs:
         config.stop()
 
-    def test_creates_pi_provider(self):
+
+@pytest.fixture(scope="module")
+def api_config():
+    """A shared api RunConfig for tests that only read from it."""
+    config = RunConfig(provider_type="api", model="gpt-4o")
+    yield config
+    config.stop()
+
+
+class TestRunConfig:
+    def test_creates_api_provider(self, api_config):
+        assert isinstance(api_config.get_provider(), ApiProvider)
+
+    def test_creates_pi_provider(self, monkeypatch):
+        from specforge.providers import pi_rpc
+        monkeypatch.setattr(pi_rpc, "_find_pi_command", lambda: "/nonexistent/pi")
         config = RunConfig(provider_type="pi")
-        # PiProvider.__init__ imports PiRpcClient, so just check the type
         provider = config.get_provider()
         assert isinstance(provider, PiProvider)
-        # Don't call stop() — would try to stop a non-started subprocess
+        # The background start failed (no Pi) — stop() must still be safe
+        config.stop()
 
-    def test_isolation(self):
+    def test_isolation(self, make_api_config):
         """Two RunConfigs don't interfere with each other."""
-        config1 = RunConfig(provider_type="api", model="gpt-4o")
-        config2 = RunConfig(provider_type="api", model="claude-sonnet-4-20250514")
+        config1 = make_api_config(model="gpt-4o")
+        config2 = make_api_config(model="claude-sonnet-4-20250514")
 
         p1 = config1.get_provider()
         p2 = config2.get_provider()
@@ -34,49 +60,37 @@ class TestRunConfig:
         assert p1._model == "gpt-4o"
         assert p2._model == "claude-sonnet-4-20250514"
 
-        config1.stop()
-        config2.stop()
-
-    def test_reuses_provider(self):
+    def test_reuses_provider(self, api_config):
         """Same RunConfig returns the same provider instance."""
-        config = RunConfig(provider_type="api")
-        p1 = config.get_provider()
-        p2 = config.get_provider()
-        assert p1 is p2
-        config.stop()
+        assert api_config.get_provider() is api_config.get_provider()
 
-    def test_stop_clears_provider(self):
+    def test_stop_clears_provider(self, make_api_config):
         """After stop(), get_provider() creates a new instance."""
-        config = RunConfig(provider_type="api")
+        config = make_api_config()
         p1 = config.get_provider()
         config.stop()
         p2 = config.get_provider()
         assert p1 is not p2
-        config.stop()
 
-    def test_api_key_passed_to_provider(self):
+    def test_api_key_passed_to_provider(self, make_api_config):
         """RunConfig passes api_key to ApiProvider."""
-        config = RunConfig(provider_type="api", model="gpt-4o", api_key="sk-test-123")
-        provider = config.get_provider()
+        provider = make_api_config(model="gpt-4o", api_key="sk-test-123").get_provider()
         assert isinstance(provider, ApiProvider)
         assert provider._api_key == "sk-test-123"
-        config.stop()
 
-    def test_on_progress_callback(self):
+    def test_on_progress_callback(self, make_api_config):
         """RunConfig can carry a per-run progress callback."""
         received = []
-        config = RunConfig(provider_type="api", on_progress=lambda ev: received.append(ev))
+        config = make_api_config(on_progress=lambda ev: received.append(ev))
         assert config.on_progress is not None
-        config.stop()
 
-    def test_get_run_callback_from_state(self):
+    def test_get_run_callback_from_state(self, make_api_config):
         """events.get_run_callback extracts callback from state with run_config."""
         received = []
         callback = lambda ev: received.append(ev)
-        config = RunConfig(provider_type="api", on_progress=callback)
+        config = make_api_config(on_progress=callback)
         state = {"run_config": config}
         assert events.get_run_callback(state) is callback
-        config.stop()
 
     def test_get_run_callback_returns_none_without_config(self):
         """events.get_run_callback returns None when no run_config."""
@@ -108,3 +122,68 @@ class TestRunConfig:
 
         assert run_a == ["for-a"]
         assert run_b == ["for-b"]
+
+
+class TestApiProviderClientReuse:
+    def test_llm_client_built_once_per_temperature(self, monkeypatch):
+        import specforge.providers as providers
+
+        built = []
+        monkeypatch.setattr(
+            providers, "get_llm",
+            lambda temperature, api_key=None, model_override=None: built.append(temperature) or object(),
+        )
+        provider = ApiProvider(model="gpt-4o", api_key="sk-test")
+
+        assert provider._get_llm(0.1) is provider._get_llm(0.1)
+        assert provider._get_llm(0.2) is not provider._get_llm(0.1)
+        assert built == [0.1, 0.2]
+
+
+class TestContextProvider:
+    def test_set_provider_type_is_context_local(self):
+        import contextvars
+        from specforge.providers import get_provider, set_provider_type, stop_provider
+
+        set_provider_type("api")
+        try:
+            outer = get_provider()
+            ctx = contextvars.Context()
+            inner = ctx.run(lambda: (set_provider_type("pi"), get_provider())[1])
+            assert isinstance(outer, ApiProvider)
+            assert isinstance(inner, PiProvider)
+            # Setting a provider in the other context didn't replace ours
+            assert get_provider() is outer
+        finally:
+            stop_provider()
+
+
+class TestPiProviderPreload:
+    def test_preload_starts_in_background(self):
+        provider = PiProvider()
+        provider._client = MagicMock()
+        provider._client.prompt.return_value = "ok"
+
+        provider.preload()
+        assert provider.invoke("sys", "user") == "ok"
+        assert provider._client.start.call_count == 1
+
+        provider.stop()
+        provider._client.stop.assert_called_once()
+
+    def test_failed_preload_surfaces_on_invoke(self):
+        provider = PiProvider()
+        provider._client = MagicMock()
+        provider._client.start.side_effect = FileNotFoundError("Pi not found")
+
+        provider.preload()
+        with pytest.raises(FileNotFoundError):
+            provider.invoke("sys", "user")
+
+
+class TestRunConfigSlots:
+    def test_no_instance_dict(self):
+        config = RunConfig()
+        assert not hasattr(config, "__dict__")
+        with pytest.raises(AttributeError):
+            config.unknown_option = True
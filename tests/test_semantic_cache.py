@@ -0,0 +1,148 @@
+"""Tests for the semantic (near-duplicate) response cache."""
+
+import zlib
+from unittest.mock import MagicMock
+
+from specforge.agents.coder import _build_batch_prompt
+from specforge.prompts.tester import ANALYSIS_PROMPT
+from specforge.providers import ApiProvider, RunConfig, SemanticCacheProvider
+from specforge.providers.semantic_cache import split_prompt
+
+# Well past the 256-token window of all-MiniLM-L6-v2
+_LONG_DESIGN = "\n".join(f"  - GET /resource{i}/{{id}} returns resource {i} by id" for i in range(80))
+
+
+def _encoder(text: str) -> list[float]:
+    """Bag-of-words over the first 256 tokens, like a model that truncates its input."""
+    vector = [0.0] * 64
+    for token in text.split()[:256]:
+        vector[zlib.crc32(token.encode()) % 64] += 1.0
+    return vector
+
+
+def _coder_prompt(instruction: str, errors: str = "") -> str:
+    error_context = f"ERRORS FROM PREVIOUS RUN:\n{errors}\n\nFEEDBACK:\nfix it" if errors else ""
+    return _build_batch_prompt({"instruction": instruction}, _LONG_DESIGN, error_context, {})
+
+
+def _make_provider(tmp_path, inner=None):
+    inner = inner or MagicMock()
+    if not inner.invoke.side_effect:
+        inner.invoke.side_effect = lambda system, user: f"answer {inner.invoke.call_count}"
+    return SemanticCacheProvider(inner, cache_dir=tmp_path, encoder=_encoder), inner
+
+
+class TestRunConfigWrapping:
+    def test_not_wrapped_by_default(self, monkeypatch):
+        monkeypatch.delenv("SPECFORGE_SEMANTIC_CACHE", raising=False)
+        provider = RunConfig(model="gpt-4o", api_key="sk-test").get_provider()
+        assert isinstance(provider, ApiProvider)
+
+    def test_wrapped_when_enabled(self, monkeypatch):
+        monkeypatch.setenv("SPECFORGE_SEMANTIC_CACHE", "1")
+        provider = RunConfig(model="gpt-4o", api_key="sk-test").get_provider()
+        assert isinstance(provider, SemanticCacheProvider)
+
+
+class TestSplitPrompt:
+    def test_no_varying_section(self):
+        assert split_prompt("sys", _coder_prompt("Generate core files.")) is None
+
+    def test_instruction_is_part_of_key(self):
+        errors = "E   ImportError: cannot import name 'Task'"
+        routers = split_prompt("sys", _coder_prompt("Generate routers.", errors))
+        tests = split_prompt("sys", _coder_prompt("Generate tests.", errors))
+        assert routers[1] == tests[1] == errors + "\n\nFEEDBACK:\nfix it"
+        assert routers[0] != tests[0]
+
+    def test_system_prompt_is_part_of_key(self):
+        user = _coder_prompt("Generate routers.", "E   boom")
+        assert split_prompt("sys a", user)[0] != split_prompt("sys b", user)[0]
+
+
+class TestSemanticCacheProvider:
+    def test_shared_long_prefix_does_not_collide(self, tmp_path):
+        """Batches share >256 tokens of design but must not answer for each other."""
+        previous_run, _ = _make_provider(tmp_path)
+        errors = "E   AssertionError: assert 404 == 200"
+        previous_run.invoke("sys", _coder_prompt("Generate the routers batch.", errors))
+
+        provider, inner = _make_provider(tmp_path)
+        provider.invoke("sys", _coder_prompt("Generate the tests batch.", errors))
+        assert inner.invoke.call_count == 1
+
+    def test_similar_errors_hit_across_runs(self, tmp_path):
+        previous_run, _ = _make_provider(tmp_path)
+        instruction = "Generate the routers batch."
+        errors = "E   AssertionError: assert 404 == 200\nFAILED tests/test_tasks.py::test_get_task"
+        first = previous_run.invoke("sys", _coder_prompt(instruction, errors))
+
+        provider, inner = _make_provider(tmp_path)
+        again = provider.invoke("sys", _coder_prompt(instruction, errors + " "))
+        assert again == first
+        assert inner.invoke.call_count == 0
+
+    def test_same_run_never_replays_its_own_answer(self, tmp_path):
+        """A near-identical error in the same run means the last fix failed."""
+        provider, inner = _make_provider(tmp_path)
+        instruction = "Generate the routers batch."
+        errors = "E   AssertionError: assert 404 == 200\nFAILED tests/test_tasks.py::test_get_task"
+
+        first = provider.invoke("sys", _coder_prompt(instruction, errors))
+        again = provider.invoke("sys", _coder_prompt(instruction, errors + " "))
+        assert inner.invoke.call_count == 2
+        assert again != first
+
+    def test_different_errors_miss(self, tmp_path):
+        previous_run, _ = _make_provider(tmp_path)
+        instruction = "Generate the routers batch."
+        previous_run.invoke("sys", _coder_prompt(instruction, "E   ImportError: no module named jose"))
+
+        provider, inner = _make_provider(tmp_path)
+        provider.invoke("sys", _coder_prompt(instruction, "E   sqlite3.OperationalError: no such table: users"))
+        assert inner.invoke.call_count == 1
+
+    def test_tester_analysis_keyed_on_file_list(self, tmp_path):
+        previous_run, _ = _make_provider(tmp_path)
+        output = "FAILED tests/test_tasks.py::test_create - assert 422 == 201"
+        previous_run.invoke("analyst", ANALYSIS_PROMPT.format(pytest_output=output, file_list="- app/main.py"))
+
+        provider, inner = _make_provider(tmp_path)
+        provider.invoke("analyst", ANALYSIS_PROMPT.format(pytest_output=output, file_list="- app/other.py"))
+        provider.invoke("analyst", ANALYSIS_PROMPT.format(pytest_output=output, file_list="- app/main.py"))
+        assert inner.invoke.call_count == 1
+
+    def test_prompts_without_varying_section_bypass(self, tmp_path):
+        provider, inner = _make_provider(tmp_path)
+        provider.invoke("sys", _coder_prompt("Generate core files."))
+        provider.invoke("sys", _coder_prompt("Generate core files."))
+        assert inner.invoke.call_count == 2
+        assert not (tmp_path / "entries.jsonl").exists()
+
+    def test_invoke_many_mixes_hits_and_misses(self, tmp_path):
+        previous_run, _ = _make_provider(tmp_path)
+        errors = "E   KeyError: 'id'"
+        cached = previous_run.invoke("sys", _coder_prompt("Generate tests.", errors))
+
+        provider, inner = _make_provider(tmp_path)
+        inner.invoke_many.side_effect = lambda prompts: [f"many {i}" for i in range(len(prompts))]
+        results = provider.invoke_many([
+            ("sys", _coder_prompt("Generate tests.", errors)),
+            ("sys", _coder_prompt("Generate infra.", errors)),
+            ("sys", _coder_prompt("Generate core files.")),
+        ])
+        assert results == [cached, "many 0", "many 1"]
+        assert len(inner.invoke_many.call_args.args[0]) == 2
+
+    def test_store_appends_and_reloads(self, tmp_path):
+        provider, _ = _make_provider(tmp_path)
+        provider.invoke("sys", _coder_prompt("Generate tests.", "E   KeyError: 'id'"))
+        provider.invoke("sys", _coder_prompt("Generate infra.", "E   KeyError: 'id'"))
+        entries = tmp_path / "entries.jsonl"
+        assert len(entries.read_bytes().splitlines()) == 2
+
+        with open(entries, "ab") as f:
+            f.write(b'{"key": "torn')  # A crashed writer's partial line is skipped
+        reloaded, inner = _make_provider(tmp_path)
+        assert reloaded.invoke("sys", _coder_prompt("Generate infra.", "E   KeyError: 'id'")) == "answer 2"
+        assert inner.invoke.call_count == 0
@@ -1,5 +1,8 @@
 """Tests for the verification checks."""
 
+import functools
+from types import MappingProxyType
+
 import pytest
 
 from specforge.agents.verifier import (
@@ -39,33 +42,90 @@ class TestCheckTestsPass:
 # ── Check 4: Spec coverage ─────────────────────────────────────────
 
 
+# Inputs for TestCheckSpecCoverage. check_spec_coverage only reads them,
+# so they're built once and shared.
+
+_TASKS_ROUTER = {
+    "app/routers/tasks.py": '@router.get("/tasks")\n@router.post("/tasks")\n',
+}
+_TASKS_ROUTER_GET_ONLY = {
+    "app/routers/tasks.py": '@router.get("/tasks")\n',
+}
+_TASKS_DESIGN = {
+    "endpoints": [
+        {"method": "GET", "path": "/tasks"},
+        {"method": "POST", "path": "/tasks"},
+    ]
+}
+_TASKS_DESIGN_WITH_DELETE = {
+    "endpoints": [
+        {"method": "GET", "path": "/tasks"},
+        {"method": "POST", "path": "/tasks"},
+        {"method": "DELETE", "path": "/tasks/{id}"},
+    ]
+}
+
+_INCLUDE_PREFIX_FILES = {
+    "app/main.py": (
+        'from app.routers.auth import router as auth_router\n'
+        'app.include_router(auth_router, prefix="/api/auth")\n'
+    ),
+    "app/routers/auth.py": (
+        '@router.post("/register")\n'
+        'def register(): pass\n'
+        '@router.post("/login")\n'
+        'def login(): pass\n'
+    ),
+}
+_AUTH_DESIGN = {
+    "endpoints": [
+        {"method": "POST", "path": "/api/auth/register"},
+        {"method": "POST", "path": "/api/auth/login"},
+    ]
+}
+
+_APIROUTER_PREFIX_FILES = {
+    "app/main.py": (
+        'from app.routers import auth, bookmarks\n'
+        'app.include_router(auth.router)\n'
+        'app.include_router(bookmarks.router)\n'
+    ),
+    "app/routers/auth.py": (
+        'router = APIRouter(prefix="/api/auth", tags=["Auth"])\n'
+        '@router.post("/register")\n'
+        'def register(): pass\n'
+        '@router.post("/login")\n'
+        'def login(): pass\n'
+    ),
+    "app/routers/bookmarks.py": (
+        'router = APIRouter(prefix="/api/bookmarks", tags=["Bookmarks"])\n'
+        '@router.get("/")\n'
+        'def list_bookmarks(): pass\n'
+        '@router.post("/")\n'
+        'def create_bookmark(): pass\n'
+        '@router.get("/{bookmark_id}")\n'
+        'def get_bookmark(): pass\n'
+    ),
+}
+_AUTH_AND_BOOKMARKS_DESIGN = {
+    "endpoints": [
+        {"method": "POST", "path": "/api/auth/register"},
+        {"method": "POST", "path": "/api/auth/login"},
+        {"method": "GET", "path": "/api/bookmarks"},
+        {"method": "POST", "path": "/api/bookmarks"},
+        {"method": "GET", "path": "/api/bookmarks/{id}"},
+    ]
+}
+
+
 class TestCheckSpecCoverage:
     def test_full_coverage(self):
-        files = {
-            "app/routers/tasks.py": '@router.get("/tasks")\n@router.post("/tasks")\n',
-        }
-        design = {
-            "endpoints": [
-                {"method": "GET", "path": "/tasks"},
-                {"method": "POST", "path": "/tasks"},
-            ]
-        }
-        result = check_spec_coverage(files, design)
+        result = check_spec_coverage(_TASKS_ROUTER, _TASKS_DESIGN)
         assert result.passed
         assert "2" in result.details
 
     def test_missing_endpoint(self):
-        files = {
-            "app/routers/tasks.py": '@router.get("/tasks")\n',
-        }
-        design = {
-            "endpoints": [
-                {"method": "GET", "path": "/tasks"},
-                {"method": "POST", "path": "/tasks"},
-                {"method": "DELETE", "path": "/tasks/{id}"},
-            ]
-        }
-        result = check_spec_coverage(files, design)
+        result = check_spec_coverage(_TASKS_ROUTER_GET_ONLY, _TASKS_DESIGN_WITH_DELETE)
         assert not result.passed
         assert "Missing" in result.details
 
@@ -101,77 +161,32 @@ class TestCheckSpecCoverage:
 
     def test_router_with_include_prefix(self):
         """Routes with include_router prefix should be combined correctly."""
-        files = {
-            "app/main.py": (
-                'from app.routers.auth import router as auth_router\n'
-                'app.include_router(auth_router, prefix="/api/auth")\n'
-            ),
-            "app/routers/auth.py": (
-                '@router.post("/register")\n'
-                'def register(): pass\n'
-                '@router.post("/login")\n'
-                'def login(): pass\n'
-            ),
-        }
-        design = {
-            "endpoints": [
-                {"method": "POST", "path": "/api/auth/register"},
-                {"method": "POST", "path": "/api/auth/login"},
-            ]
-        }
-        result = check_spec_coverage(files, design)
+        result = check_spec_coverage(_INCLUDE_PREFIX_FILES, _AUTH_DESIGN)
         assert result.passed, f"Expected pass but got: {result.details}"
 
     def test_router_with_apirouter_prefix(self):
         """Routes with APIRouter(prefix=...) should be combined correctly."""
-        files = {
-            "app/main.py": (
-                'from app.routers import auth, bookmarks\n'
-                'app.include_router(auth.router)\n'
-                'app.include_router(bookmarks.router)\n'
-            ),
-            "app/routers/auth.py": (
-                'router = APIRouter(prefix="/api/auth", tags=["Auth"])\n'
-                '@router.post("/register")\n'
-                'def register(): pass\n'
-                '@router.post("/login")\n'
-                'def login(): pass\n'
-            ),
-            "app/routers/bookmarks.py": (
-                'router = APIRouter(prefix="/api/bookmarks", tags=["Bookmarks"])\n'
-                '@router.get("/")\n'
-                'def list_bookmarks(): pass\n'
-                '@router.post("/")\n'
-                'def create_bookmark(): pass\n'
-                '@router.get("/{bookmark_id}")\n'
-                'def get_bookmark(): pass\n'
-            ),
-        }
-        design = {
-            "endpoints": [
-                {"method": "POST", "path": "/api/auth/register"},
-                {"method": "POST", "path": "/api/auth/login"},
-                {"method": "GET", "path": "/api/bookmarks"},
-                {"method": "POST", "path": "/api/bookmarks"},
-                {"method": "GET", "path": "/api/bookmarks/{id}"},
-            ]
-        }
-        result = check_spec_coverage(files, design)
+        result = check_spec_coverage(_APIROUTER_PREFIX_FILES, _AUTH_AND_BOOKMARKS_DESIGN)
         assert result.passed, f"Expected pass but got: {result.details}"
 
 
 # ── Check 5: Tests meaningful ───────────────────────────────────────
 
 
+@functools.lru_cache(maxsize=None)
+def _design_with_n_endpoints(n: int) -> MappingProxyType:
+    """A read-only design with n endpoints. Cached, so it must not be mutable."""
+    endpoints = tuple(MappingProxyType({"path": f"/ep{i}"}) for i in range(n))
+    return MappingProxyType({"endpoints": endpoints})
+
+
 class TestCheckTestsMeaningful:
     def test_enough_tests(self):
-        design = {"endpoints": [{"path": f"/ep{i}"} for i in range(5)]}
-        result = check_tests_meaningful(total_tests=8, system_design=design)
+        result = check_tests_meaningful(total_tests=8, system_design=_design_with_n_endpoints(5))
         assert result.passed
 
     def test_too_few_tests(self):
-        design = {"endpoints": [{"path": f"/ep{i}"} for i in range(10)]}
-        result = check_tests_meaningful(total_tests=3, system_design=design)
+        result = check_tests_meaningful(total_tests=3, system_design=_design_with_n_endpoints(10))
         assert not result.passed
         assert "expected at least 10" in result.details
 
@@ -1,14 +1,37 @@
 """Tests for the SpecForge Web backend."""
 
+import asyncio
+import gzip
+import json
+import threading
+import zipfile
+from io import BytesIO
+
 import pytest
 from fastapi.testclient import TestClient
 
-from web.backend.main import app, _jobs
+from specforge import events
+from web.backend import main
+from web.backend.main import (
+    _EVENT_BATCH_MAX,
+    _ZIP_STORE_BELOW,
+    MAX_SPEC_CHARS,
+    _ProgressStream,
+    _accepts_gzip,
+    _build_zip,
+    _jobs,
+    _load_examples,
+    _store_job,
+    _validate_spec,
+    app,
+)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    return TestClient(app)
+    """One TestClient for the module — per-test state lives in _jobs (cleared below)."""
+    with TestClient(app) as c:
+        yield c
 
 
 @pytest.fixture(autouse=True)
@@ -46,6 +69,53 @@ class TestExamplesEndpoint:
         assert "content" in example
         assert len(example["content"]) > 100  # Not empty
 
+    def test_served_from_startup_cache(self, client, monkeypatch):
+        """Examples are read once at startup, not on every request."""
+        monkeypatch.setattr(main, "_load_examples", lambda *a, **kw: pytest.fail("read from disk"))
+        resp = client.get("/api/examples")
+        assert resp.headers["content-type"] == "application/json"
+        assert len(resp.json()["examples"]) >= 1
+
+    def test_gzip_only_when_accepted(self, client):
+        zipped = client.get("/api/examples", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in zipped.headers["vary"]
+
+        plain = client.get("/api/examples", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == zipped.json()
+        # The gzipped body is the same JSON, compressed once at startup
+        assert json.loads(gzip.decompress(main._EXAMPLES_JSON_GZ)) == plain.json()
+
+    @pytest.mark.parametrize("header, expected", [
+        pytest.param("gzip, deflate, br", True, id="gzip"),
+        pytest.param("br;q=1.0, GZIP;q=0.5", True, id="case-and-q"),
+        pytest.param("*", True, id="wildcard"),
+        pytest.param("gzip;q=0", False, id="refused"),
+        pytest.param("gzip; q=0.000", False, id="refused-padded"),
+        pytest.param("*;q=0, gzip", True, id="explicit-over-wildcard"),
+        pytest.param("gzip;q=0, *", False, id="explicit-refusal-over-wildcard"),
+        pytest.param("gzip;q=0.001", True, id="small-q"),
+        pytest.param("gzip;q=high", False, id="malformed-q"),
+        pytest.param("deflate", False, id="other"),
+        pytest.param("", False, id="none"),
+    ])
+    def test_accepts_gzip(self, header, expected):
+        assert _accepts_gzip(header) is expected
+
+    def test_load_examples_title_fallback(self, tmp_path):
+        (tmp_path / "with-heading.md").write_text("intro\n# Real Title \nbody\n", encoding="utf-8")
+        (tmp_path / "no-heading.md").write_text("just text\n", encoding="utf-8")
+        (tmp_path / "sub-only.md").write_text("## Section\n#tag\n", encoding="utf-8")
+        (tmp_path / "crlf.md").write_text("# Windows Title\r\nbody\r\n", encoding="utf-8", newline="")
+        titles = {e["name"]: e["title"] for e in _load_examples(tmp_path)}
+        assert titles == {
+            "with-heading": "Real Title",
+            "no-heading": "No Heading",
+            "sub-only": "Sub Only",
+            "crlf": "Windows Title",
+        }
+
 
 class TestJobFiles:
     def test_get_files_not_found(self, client):
@@ -64,6 +134,16 @@ class TestJobFiles:
         assert data["files"]["app/main.py"] == "print('hello')"
         assert data["status"] == "success"
 
+    def test_eviction_spares_recently_read_jobs(self, client, monkeypatch):
+        monkeypatch.setattr(main, "MAX_JOBS", 2)
+
+        main._store_job("old", {"files": {}, "status": "success"})
+        main._store_job("newer", {"files": {}, "status": "success"})
+        client.get("/api/jobs/old/files")  # Reading "old" makes "newer" the LRU entry
+        main._store_job("newest", {"files": {}, "status": "success"})
+
+        assert list(_jobs) == ["old", "newest"]
+
 
 class TestDownloadZip:
     def test_download_not_found(self, client):
@@ -83,14 +163,86 @@ class TestDownloadZip:
         assert resp.headers["content-type"] == "application/zip"
         assert "test-456.zip" in resp.headers["content-disposition"]
         # Verify it's actually a valid ZIP
-        import zipfile
-        from io import BytesIO
         zf = zipfile.ZipFile(BytesIO(resp.content))
         names = zf.namelist()
         assert "app/main.py" in names
         assert "requirements.txt" in names
         assert zf.read("requirements.txt").decode() == "fastapi\nuvicorn"
 
+    def test_stored_files_zip_in_path_order(self, client):
+        _store_job("test-order", {
+            "files": {"tests/test_a.py": "", "app/main.py": "", "Dockerfile": ""},
+            "status": "success",
+        })
+        assert list(_jobs["test-order"]["files"]) == ["Dockerfile", "app/main.py", "tests/test_a.py"]
+
+        resp = client.get("/api/jobs/test-order/download")
+        assert zipfile.ZipFile(BytesIO(resp.content)).namelist() == list(_jobs["test-order"]["files"])
+
+    def test_repeat_download_uses_etag(self, client):
+        _jobs["test-etag"] = {"files": {"app/main.py": "app = 1\n"}, "status": "success"}
+        first = client.get("/api/jobs/test-etag/download")
+        etag = first.headers["etag"]
+        assert _jobs["test-etag"]["zip_bytes"] == first.content
+
+        again = client.get("/api/jobs/test-etag/download", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+
+    def test_zip_cache_stays_in_budget(self, client, monkeypatch):
+        for i in range(3):
+            _jobs[f"job-{i}"] = {"files": {"a.py": f"v = {i}\n"}, "status": "success"}
+            client.get(f"/api/jobs/job-{i}/download")
+        one_zip = len(_jobs["job-0"]["zip_bytes"])
+
+        monkeypatch.setattr(main, "_ZIP_CACHE_MAX_TOTAL", one_zip * 3)
+        _jobs["job-3"] = {"files": {"a.py": "v = 3\n"}, "status": "success"}
+        client.get("/api/jobs/job-3/download")
+
+        assert "zip_bytes" not in _jobs["job-0"]  # Oldest evicted
+        assert all("zip_bytes" in _jobs[f"job-{i}"] for i in (1, 2, 3))
+
+    def test_small_archive_is_stored(self):
+        spool, _ = _build_zip({"app/main.py": "app = 1\n"})
+        with zipfile.ZipFile(spool) as zf:
+            assert zf.getinfo("app/main.py").compress_type == zipfile.ZIP_STORED
+
+    def test_large_archive_is_deflated(self):
+        spool, _ = _build_zip({"app/big.py": "x = 1\n" * _ZIP_STORE_BELOW})
+        with zipfile.ZipFile(spool) as zf:
+            assert zf.getinfo("app/big.py").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_download_spilled_to_disk(self, client, monkeypatch):
+        """Archives bigger than the spool limit still download intact."""
+        monkeypatch.setattr(main, "_ZIP_SPOOL_MAX", 128)
+        files = {f"app/module_{i}.py": f"VALUE = {i}\n" * 50 for i in range(20)}
+        _jobs["test-789"] = {"files": files, "status": "success"}
+
+        resp = client.get("/api/jobs/test-789/download")
+        assert resp.status_code == 200
+        assert int(resp.headers["content-length"]) == len(resp.content)
+        zf = zipfile.ZipFile(BytesIO(resp.content))
+        assert zf.read("app/module_7.py").decode() == files["app/module_7.py"]
+
+    def test_oversized_archive_is_streamed_uncached(self, client, monkeypatch):
+        monkeypatch.setattr(main, "_ZIP_CACHE_MAX_ITEM", 64)
+        monkeypatch.setattr(main, "_ZIP_CHUNK_SIZE", 256)
+        spools = []
+        build_zip = main._build_zip
+        monkeypatch.setattr(main, "_build_zip", lambda files: spools.append(build_zip(files)) or spools[-1])
+        files = {f"app/module_{i}.py": f"VALUE = {i}\n" * 50 for i in range(20)}
+        _jobs["test-big"] = {"files": files, "status": "success"}
+
+        resp = client.get("/api/jobs/test-big/download")
+        assert resp.status_code == 200
+        assert int(resp.headers["content-length"]) == len(resp.content)
+        assert "etag" not in resp.headers
+        zf = zipfile.ZipFile(BytesIO(resp.content))
+        assert {name: zf.read(name).decode() for name in zf.namelist()} == files
+        assert "zip_bytes" not in _jobs["test-big"]
+        assert "zip_etag" not in _jobs["test-big"]
+        assert spools[0][0].closed
+
 
 class TestFrontendServing:
     def test_serves_index_html(self, client):
@@ -111,3 +263,168 @@ class TestWebSocketGenerate:
             data = ws.receive_json()
             assert data["event"] == "error"
             assert "Empty" in data["message"]
+
+    def test_streams_progress_then_complete(self, client, monkeypatch):
+        def fake_generation(spec_text, api_key, provider, model, on_progress=None):
+            on_progress(events.ProgressEvent(agent="architect", event="start", message="Designing…"))
+            return {"status": "success", "generated_files": {"app/main.py": "x"}}
+
+        monkeypatch.setattr(main, "_run_generation", fake_generation)
+        with client.websocket_connect("/ws/generate") as ws:
+            ws.send_json({"spec": "# API", "api_key": "test"})
+            # receive_json reads text frames — what the browser's JSON.parse expects
+            progress = ws.receive_json()
+            complete = ws.receive_json()
+
+        assert progress["agent"] == "architect"
+        assert progress["message"] == "Designing…"
+        assert complete["event"] == "complete"
+        assert complete["files"] == {"app/main.py": "x"}
+
+    def test_job_ids_are_unique(self, client, monkeypatch):
+        monkeypatch.setattr(
+            main, "_run_generation",
+            lambda **kw: {"status": "success", "generated_files": {"a.py": "x"}},
+        )
+        job_ids = []
+        for _ in range(3):
+            with client.websocket_connect("/ws/generate") as ws:
+                ws.send_json({"spec": "# API", "api_key": "test"})
+                job_ids.append(ws.receive_json()["job_id"])
+
+        assert len(set(job_ids)) == 3
+        assert sorted(_jobs) == sorted(job_ids)
+
+    def test_busy_when_all_workers_taken(self, client, monkeypatch):
+        monkeypatch.setattr(main, "_gen_slots", threading.BoundedSemaphore(1))
+        main._gen_slots.acquire()  # Another run holds the only worker
+        monkeypatch.setattr(main, "_run_generation", lambda **kw: pytest.fail("should not run"))
+        with client.websocket_connect("/ws/generate") as ws:
+            ws.send_json({"spec": "# API", "api_key": "test"})
+            data = ws.receive_json()
+
+        assert data["event"] == "error"
+        assert "busy" in data["message"]
+
+    def test_worker_slot_released_after_run(self, client, monkeypatch):
+        monkeypatch.setattr(main, "_gen_slots", threading.BoundedSemaphore(1))
+        monkeypatch.setattr(
+            main, "_run_generation",
+            lambda **kw: {"status": "success", "generated_files": {"a.py": "x"}},
+        )
+        for _ in range(2):
+            with client.websocket_connect("/ws/generate") as ws:
+                ws.send_json({"spec": "# API", "api_key": "test"})
+                assert ws.receive_json()["event"] == "complete"
+
+
+class TestValidateSpec:
+    @pytest.mark.parametrize("spec, expected", [
+        pytest.param("", (False, "Empty spec"), id="empty"),
+        pytest.param("  \n\t ", (False, "Empty spec"), id="whitespace"),
+        pytest.param(None, (False, "Empty spec"), id="not-a-string"),
+        pytest.param("# My API", (True, ""), id="ok"),
+    ])
+    def test_validate(self, spec, expected):
+        assert _validate_spec(spec) == expected
+
+    def test_oversize(self):
+        ok, error = _validate_spec("x" * (MAX_SPEC_CHARS + 1))
+        assert not ok
+        assert "too large" in error
+
+
+class _FakeWebSocket:
+    """Records sent events; sends block until `gate` is set."""
+
+    def __init__(self):
+        self.sent: list[dict] = []  # Individual events, with batches unpacked
+        self.frames = 0
+        self.gate = None
+
+    async def send_text(self, text):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.frames += 1
+        message = json.loads(text)
+        self.sent.extend(message["events"] if message.get("event") == "batch" else [message])
+
+
+class TestProgressStream:
+    def _event(self, i):
+        return events.ProgressEvent(agent="coder", event="progress", message=f"step {i}")
+
+    def test_sends_in_order(self):
+        ws = _FakeWebSocket()
+
+        async def run():
+            stream = _ProgressStream(ws, asyncio.get_running_loop())
+            stream.start()
+            for i in range(5):
+                stream.offer(self._event(i))
+            await asyncio.sleep(0)
+            await stream.close()
+
+        asyncio.run(run())
+        assert [m["message"] for m in ws.sent] == [f"step {i}" for i in range(5)]
+
+    def test_drops_past_bound_and_reports(self):
+        ws = _FakeWebSocket()
+
+        async def run():
+            ws.gate = asyncio.Event()  # Client not reading yet
+            stream = _ProgressStream(ws, asyncio.get_running_loop(), maxsize=3)
+            stream.start()
+            for i in range(10):
+                stream.offer(self._event(i))
+            await asyncio.sleep(0)
+            ws.gate.set()
+            await stream.close()
+
+        asyncio.run(run())
+        *kept, marker = ws.sent
+        # The oldest events go through in order; the overflow is reported once
+        assert [m["message"] for m in kept] == [f"step {i}" for i in range(len(kept))]
+        assert len(kept) >= 3
+        assert marker["data"] == {"dropped": 10 - len(kept)}
+
+    def test_coalesces_progress_when_backed_up(self):
+        ws = _FakeWebSocket()
+
+        async def run():
+            ws.gate = asyncio.Event()
+            stream = _ProgressStream(ws, asyncio.get_running_loop(), maxsize=50, coalesce_above=2)
+            stream.start()
+            stream.offer(events.ProgressEvent(agent="coder", event="start", message="begin"))
+            for i in range(20):
+                stream.offer(self._event(i))
+            stream.offer(events.ProgressEvent(agent="coder", event="done", message="end"))
+            await asyncio.sleep(0)
+            ws.gate.set()
+            await stream.close()
+
+        asyncio.run(run())
+        messages = [m["message"] for m in ws.sent]
+        # start/done always go through; the progress backlog collapses to its latest value
+        assert messages[0] == "begin"
+        assert messages[-1] == "end"
+        assert "step 19" in messages
+        assert len(messages) < 10
+        assert not any("skipped" in m for m in messages)
+
+    def test_backlog_sent_as_batches(self):
+        ws = _FakeWebSocket()
+
+        async def run():
+            ws.gate = asyncio.Event()
+            stream = _ProgressStream(ws, asyncio.get_running_loop(), coalesce_above=1000)
+            stream.start()
+            for i in range(100):
+                stream.offer(self._event(i))
+            await asyncio.sleep(0)
+            ws.gate.set()
+            await stream.close()
+
+        asyncio.run(run())
+        assert [m["message"] for m in ws.sent] == [f"step {i}" for i in range(100)]
+        assert ws.frames <= 2 + 100 // _EVENT_BATCH_MAX
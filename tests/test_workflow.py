@@ -0,0 +1,32 @@
+"""Tests for the LangGraph workflow wiring."""
+
+from specforge import workflow
+
+
+class TestRunWorkflow:
+    def test_stops_after_architect_error(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+            workflow, "architect_node",
+            lambda state: {"status": "error", "errors": ["Architect error: boom"]},
+        )
+        final_state = workflow.run_workflow("# Spec", str(tmp_path))
+
+        assert final_state["status"] == "error"
+        assert final_state["errors"] == ["Architect error: boom"]
+        assert final_state["iteration"] == 1
+
+
+class TestRouting:
+    def test_terminal_statuses_end(self):
+        for status in ("error", "success"):
+            assert workflow._should_continue({"status": status, "iteration": 1}) == workflow.END
+
+    def test_loops_back_until_max_iterations(self):
+        state = {"status": "in_progress", "iteration": 2, "max_iterations": 4}
+        assert workflow._should_continue(state) == "coder"
+        state["iteration"] = 5
+        assert workflow._should_continue(state) == workflow.END
+
+    def test_after_architect(self):
+        assert workflow._after_architect({"status": "error"}) == workflow.END
+        assert workflow._after_architect({"status": "in_progress"}) == "coder"
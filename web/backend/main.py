@@ -3,24 +3,67 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import functools
+import gzip
+import hashlib
 import json
 import os
+import re
+import secrets
 import shutil
 import tempfile
+import threading
 import zipfile
 from collections import OrderedDict
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 
 from specforge import events
+from specforge.providers import RunConfig
+from specforge.utils import fastjson
+from specforge.workflow import run_workflow
 
-app = FastAPI(title="SpecForge Web", version="0.1.0")
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "specforge" / "examples"
+
+# /api/examples payload, serialized (and gzipped) once at startup — the files
+# don't change at runtime
+_EXAMPLES_JSON: bytes = b""
+_EXAMPLES_JSON_GZ: bytes = b""
+
+# First top-level markdown heading, e.g. "# Todo API"
+_HEADING_RE = re.compile(r"^#[ \t]+(.+)$", re.MULTILINE)
+
+
+def _load_examples(examples_dir: Path = EXAMPLES_DIR) -> list[dict]:
+    """Read the example specs, with titles taken from their first heading."""
+    specs = []
+    if examples_dir.exists():
+        for f in sorted(examples_dir.glob("*.md")):
+            content = f.read_text(encoding="utf-8")
+            heading = _HEADING_RE.search(content)
+            title = heading.group(1).strip() if heading else f.stem.replace("-", " ").title()
+            specs.append({"name": f.stem, "title": title, "content": content})
+    return specs
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    global _EXAMPLES_JSON, _EXAMPLES_JSON_GZ
+    _EXAMPLES_JSON = fastjson.dumps({"examples": await asyncio.to_thread(_load_examples)})
+    _EXAMPLES_JSON_GZ = gzip.compress(_EXAMPLES_JSON, compresslevel=6)
+    yield
+
+
+app = FastAPI(title="SpecForge Web", version="0.1.0", lifespan=_lifespan)
 
 # CORS for local dev
 app.add_middleware(
@@ -31,16 +74,56 @@ app.add_middleware(
 )
 
 # Store for completed generations: job_id -> {files, status, output_dir}
-# Uses OrderedDict with max size to prevent unbounded memory growth.
+# An OrderedDict kept in least-recently-used order, capped at MAX_JOBS.
 MAX_JOBS = 100
 _jobs: OrderedDict[str, dict] = OrderedDict()
 
 
+# Generations run on their own pool so they can't starve the default executor
+# (used by asyncio.to_thread for ZIP builds and startup loading). A run that
+# would have to queue behind busy workers is turned away instead.
+GEN_WORKERS = int(os.getenv("SPECFORGE_GEN_WORKERS", "4"))
+_GEN_POOL = ThreadPoolExecutor(max_workers=GEN_WORKERS, thread_name_prefix="specforge-gen")
+# Held for as long as a run occupies a worker — released by the worker itself,
+# so a client that disconnects mid-run doesn't free a slot that's still busy
+_gen_slots = threading.BoundedSemaphore(GEN_WORKERS)
+
+
+# Largest spec accepted over the WebSocket (characters)
+MAX_SPEC_CHARS = 200_000
+
+
+def _validate_spec(spec_text) -> tuple[bool, str]:
+    """Check a submitted spec before starting a run.
+
+    Returns (ok, error_message) — the message is empty when ok.
+    """
+    if not isinstance(spec_text, str) or not spec_text.strip():
+        return False, "Empty spec"
+    if len(spec_text) > MAX_SPEC_CHARS:
+        return False, f"Spec too large (max {MAX_SPEC_CHARS} characters)"
+    return True, ""
+
+
 def _store_job(job_id: str, data: dict) -> None:
-    """Store a job result, evicting oldest if over limit."""
+    """Store a job result, evicting the least recently used if over limit.
+
+    Files are put in path order here, once, so downloads and listings can use
+    them as stored.
+    """
+    data["files"] = dict(sorted(data.get("files", {}).items()))
     _jobs[job_id] = data
+    _jobs.move_to_end(job_id)
     while len(_jobs) > MAX_JOBS:
-        _jobs.popitem(last=False)  # Remove oldest
+        _jobs.popitem(last=False)
+
+
+def _get_job(job_id: str) -> dict | None:
+    """Look up a job, marking it as recently used."""
+    job = _jobs.get(job_id)
+    if job is not None:
+        _jobs.move_to_end(job_id)
+    return job
 
 
 @app.get("/api/health")
@@ -48,52 +131,261 @@ async def health():
     return {"status": "ok", "version": "0.1.0"}
 
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether gzip has a non-zero q. An explicit gzip entry overrides "*"."""
+    qvalues: dict[str, float] = {}
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0  # Malformed — don't guess
+        qvalues.setdefault(name.strip(), q)
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
 @app.get("/api/examples")
-async def list_examples():
+async def list_examples(request: Request):
     """List available example specs."""
-    examples_dir = Path(__file__).parent.parent.parent / "specforge" / "examples"
-    specs = []
-    if examples_dir.exists():
-        for f in sorted(examples_dir.glob("*.md")):
-            content = f.read_text(encoding="utf-8")
-            # Extract title from first heading
-            title = f.stem.replace("-", " ").title()
-            for line in content.split("\n"):
-                if line.startswith("# "):
-                    title = line[2:].strip()
-                    break
-            specs.append({"name": f.stem, "title": title, "content": content})
-    return {"examples": specs}
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=_EXAMPLES_JSON_GZ, media_type="application/json", headers=headers)
+    return Response(content=_EXAMPLES_JSON, media_type="application/json", headers=headers)
 
 
 @app.get("/api/jobs/{job_id}/files")
 async def get_job_files(job_id: str):
     """Get the generated files for a completed job."""
-    job = _jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         return {"error": "Job not found"}, 404
     return {"files": job.get("files", {}), "status": job.get("status", "unknown")}
 
 
+# ZIPs up to this size are built in memory; larger ones spill to a temp file
+_ZIP_SPOOL_MAX = 1 << 20
+_ZIP_CHUNK_SIZE = 64 * 1024
+
+# Below this much source text, storing beats deflating: the download is tiny
+# either way. Above it, level 1 gets most of the size win at a fraction of
+# the CPU of the default level 6.
+_ZIP_STORE_BELOW = 64 * 1024
+_ZIP_COMPRESSLEVEL = 1
+
+
+def _build_zip(files: dict[str, str]) -> tuple[tempfile.SpooledTemporaryFile, int]:
+    """Write files into a ZIP archive, in the order given (_store_job sorts them).
+
+    Returns (rewound file, size in bytes).
+    """
+    total = sum(len(content) for content in files.values())
+    if total < _ZIP_STORE_BELOW:
+        compression, level = zipfile.ZIP_STORED, None
+    else:
+        compression, level = zipfile.ZIP_DEFLATED, _ZIP_COMPRESSLEVEL
+
+    spool = tempfile.SpooledTemporaryFile(max_size=_ZIP_SPOOL_MAX)
+    with zipfile.ZipFile(spool, "w", compression, compresslevel=level) as zf:
+        for filepath, content in files.items():
+            zf.writestr(filepath, content)
+    size = spool.tell()
+    spool.seek(0)
+    return spool, size
+
+
+def _iter_chunks(f) -> Iterator[bytes]:
+    """Yield a file's contents in chunks, closing it when done."""
+    try:
+        while chunk := f.read(_ZIP_CHUNK_SIZE):
+            yield chunk
+    finally:
+        f.close()
+
+
+# Built ZIPs are kept on the job so repeat downloads skip compression.
+# Archives above the per-job limit are streamed and never cached.
+_ZIP_CACHE_MAX_ITEM = 8 << 20
+_ZIP_CACHE_MAX_TOTAL = 256 << 20
+
+
+def _cache_zip(job: dict, data: bytes) -> None:
+    """Attach a built ZIP (and its ETag) to a job, evicting older ones to stay in budget."""
+    if len(data) > _ZIP_CACHE_MAX_ITEM:
+        return
+    total = sum(len(j.get("zip_bytes", b"")) for j in _jobs.values()) + len(data)
+    for other in _jobs.values():  # Oldest first
+        if total <= _ZIP_CACHE_MAX_TOTAL:
+            break
+        if "zip_bytes" in other and other is not job:
+            total -= len(other.pop("zip_bytes"))
+            other.pop("zip_etag", None)
+    job["zip_bytes"] = data
+    job["zip_etag"] = f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
 @app.get("/api/jobs/{job_id}/download")
-async def download_zip(job_id: str):
+async def download_zip(job_id: str, request: Request):
     """Download generated files as a ZIP."""
-    job = _jobs.get(job_id)
+    job = _get_job(job_id)
     if not job or not job.get("files"):
         return Response(content="Job not found", status_code=404)
 
-    # Create ZIP in memory
-    buffer = BytesIO()
-    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for filepath, content in sorted(job["files"].items()):
-            zf.writestr(filepath, content)
-    buffer.seek(0)
+    headers = {"Content-Disposition": f"attachment; filename={job_id}.zip"}
+
+    if "zip_bytes" not in job:
+        # Compress off the event loop
+        spool, size = await asyncio.to_thread(_build_zip, job["files"])
+        if size > _ZIP_CACHE_MAX_ITEM:
+            # Too big to keep around — stream it back in chunks. The background
+            # task closes the spool even if the body is never iterated.
+            headers["Content-Length"] = str(size)
+            return StreamingResponse(
+                _iter_chunks(spool),
+                media_type="application/zip",
+                headers=headers,
+                background=BackgroundTask(spool.close),
+            )
+        with spool:
+            _cache_zip(job, spool.read())
+
+    headers["ETag"] = job["zip_etag"]
+    if _etag_matches(request.headers.get("if-none-match"), job["zip_etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=job["zip_bytes"], media_type="application/zip", headers=headers)
+
+
+async def _send_json(websocket: WebSocket, payload: dict) -> None:
+    """Like websocket.send_json, but serialized with fastjson.
+
+    Sent as a text frame: the frontend JSON.parses event.data, which a binary
+    frame would hand it as a Blob.
+    """
+    await _send_raw(websocket, fastjson.dumps(payload))
+
+
+async def _send_raw(websocket: WebSocket, data: bytes) -> None:
+    """Send already-serialized JSON, as a text frame (see _send_json)."""
+    await websocket.send_text(data.decode("utf-8"))
 
-    return Response(
-        content=buffer.getvalue(),
-        media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={job_id}.zip"},
-    )
+
+# Progress events buffered per WebSocket before new ones are dropped
+_EVENT_QUEUE_MAX = 256
+# Past this backlog, a "progress" event replaces the still-unsent one from the
+# same agent instead of queueing behind it
+_EVENT_COALESCE_ABOVE = 128
+# Most events sent together in one {"event": "batch"} frame
+_EVENT_BATCH_MAX = 32
+
+
+class _ProgressStream:
+    """Bounded buffer between a generation thread and its WebSocket.
+
+    The workflow thread hands events to offer(); a sender task on the event
+    loop forwards them in order. If the client reads slower than events
+    arrive, chatty "progress" updates are coalesced to the latest per
+    (agent, event), and anything still past the bound is dropped and counted —
+    the client is told how many it missed once the backlog clears.
+
+    Events that queue up while a send is in flight go out together as one
+    {"event": "batch", "events": [...]} frame; an idle stream sends each
+    event on its own, without waiting to fill a batch.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        loop: asyncio.AbstractEventLoop,
+        maxsize: int = _EVENT_QUEUE_MAX,
+        coalesce_above: int = _EVENT_COALESCE_ABOVE,
+    ):
+        self._websocket = websocket
+        self._loop = loop
+        # Queued as one-item lists so a pending event can be swapped in place
+        self._queue: asyncio.Queue[list[events.ProgressEvent]] = asyncio.Queue(maxsize)
+        self._coalesce_above = coalesce_above
+        self._pending: dict[tuple[str, str], list[events.ProgressEvent]] = {}
+        self._dropped = 0
+        self._sender: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._sender = asyncio.create_task(self._drain())
+
+    def offer(self, ev: events.ProgressEvent) -> None:
+        """Queue an event for sending. Safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._put, ev)
+
+    def _put(self, ev: events.ProgressEvent) -> None:
+        key = (ev.agent, ev.event)
+        if ev.event == "progress" and self._queue.qsize() >= self._coalesce_above:
+            slot = self._pending.get(key)
+            if slot is not None:
+                slot[0] = ev  # The unsent update is stale — send this one instead
+                return
+        slot = [ev]
+        try:
+            self._queue.put_nowait(slot)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            return
+        if ev.event == "progress":
+            self._pending[key] = slot
+
+    async def _drain(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # Whatever piled up while the last send was in flight shares its frame
+            while len(batch) < _EVENT_BATCH_MAX and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            encoded = []
+            for slot in batch:
+                ev = slot[0]
+                key = (ev.agent, ev.event)
+                if self._pending.get(key) is slot:
+                    del self._pending[key]
+                encoded.append(ev.json_bytes)
+            if self._dropped and self._queue.empty():
+                dropped, self._dropped = self._dropped, 0
+                encoded.append(events.ProgressEvent(
+                    agent="workflow",
+                    event="progress",
+                    message=f"({dropped} progress messages skipped)",
+                    data={"dropped": dropped},
+                ).json_bytes)
+
+            # Events are serialized once (ProgressEvent.json_bytes); a batch
+            # frame is spliced together around them rather than re-encoded
+            if len(encoded) == 1:
+                frame = encoded[0]
+            else:
+                frame = b'{"event":"batch","events":[' + b",".join(encoded) + b"]}"
+            try:
+                await _send_raw(self._websocket, frame)
+            except Exception:
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def close(self) -> None:
+        """Wait for queued events to be sent, then stop the sender."""
+        if self._sender is None:
+            return
+        if not self._sender.done():
+            await self._queue.join()
+        self._sender.cancel()
 
 
 @app.websocket("/ws/generate")
@@ -106,6 +398,7 @@ async def ws_generate(websocket: WebSocket):
     Server streams:
         {"agent": "architect", "event": "start", "message": "...", ...}
         {"agent": "coder", "event": "progress", "message": "...", ...}
+        {"event": "batch", "events": [{"agent": ...}, ...]}  (when the client falls behind)
         ...
         {"event": "complete", "job_id": "abc123", "files": {...}}
     """
@@ -119,53 +412,67 @@ async def ws_generate(websocket: WebSocket):
         provider = data.get("provider", "openai")
         model = data.get("model", "gpt-4o")
 
-        if not spec_text.strip():
-            await websocket.send_json({"event": "error", "message": "Empty spec"})
+        ok, error = _validate_spec(spec_text)
+        if not ok:
+            await _send_json(websocket, {"event": "error", "message": error})
             return
 
-        # Set up per-run progress callback (scoped to this WebSocket)
-        loop = asyncio.get_event_loop()
-
-        async def send_event(ev: events.ProgressEvent):
-            try:
-                await websocket.send_json(ev.to_dict())
-            except Exception:
-                pass
+        if not _gen_slots.acquire(blocking=False):
+            await _send_json(websocket, {
+                "event": "error",
+                "message": "Server busy — too many generations running, try again shortly",
+            })
+            return
 
-        def on_progress(ev: events.ProgressEvent):
-            """Per-run callback — only this WebSocket receives these events."""
-            asyncio.run_coroutine_threadsafe(send_event(ev), loop)
+        # Per-run progress stream (scoped to this WebSocket)
+        stream = _ProgressStream(websocket, asyncio.get_running_loop())
+        stream.start()
 
-        # Run generation in a thread (it's synchronous)
-        job_id = f"job-{id(websocket)}"
-        result = await asyncio.to_thread(
+        # Run generation on the generation pool (it's synchronous)
+        # Random, not id(websocket): ids of closed sockets get reused and would
+        # overwrite an earlier job (and its cached ZIP)
+        job_id = f"job-{secrets.token_urlsafe(9)}"
+        run = functools.partial(
             _run_generation,
             spec_text=spec_text,
             api_key=api_key,
             provider=provider,
             model=model,
-            on_progress=on_progress,
+            on_progress=stream.offer,
         )
+        try:
+            # Carry our contextvars into the worker, as asyncio.to_thread would
+            future = _GEN_POOL.submit(contextvars.copy_context().run, run)
+        except BaseException:
+            _gen_slots.release()
+            raise
+        future.add_done_callback(lambda _: _gen_slots.release())
+        try:
+            result = await asyncio.wrap_future(future)
+        finally:
+            # Everything the run emitted goes out before completion or error
+            await stream.close()
 
         # Store result (with size limit)
-        _store_job(job_id, {
+        job = {
             "files": result.get("generated_files", {}),
             "status": result.get("status", "unknown"),
-        })
+        }
+        _store_job(job_id, job)
 
         # Send completion
-        await websocket.send_json({
+        await _send_json(websocket, {
             "event": "complete",
             "job_id": job_id,
-            "status": result.get("status", "unknown"),
-            "files": result.get("generated_files", {}),
+            "status": job["status"],
+            "files": job["files"],
         })
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         try:
-            await websocket.send_json({"event": "error", "message": str(e)})
+            await _send_json(websocket, {"event": "error", "message": str(e)})
         except Exception:
             pass
 
@@ -182,9 +489,6 @@ def _run_generation(
     Thread-safe: uses RunConfig instead of global state.
     API key is passed through RunConfig, never set in os.environ.
     """
-    from specforge.providers import RunConfig
-    from specforge.workflow import run_workflow
-
     # Create per-run config — no globals, no os.environ mutation
     run_config = RunConfig(
         provider_type=provider,
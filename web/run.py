@@ -1,11 +1,25 @@
 """Start the SpecForge Web UI server."""
 
+import sys
+
 import uvicorn
 
 
+def _event_loop() -> str:
+    """uvloop where it's installed and supported, else the stdlib asyncio loop."""
+    if sys.platform == "win32":
+        return "asyncio"  # uvloop doesn't support Windows
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return "asyncio"
+    return "uvloop"
+
+
 def main():
+    loop = _event_loop()
     print("Starting SpecForge Web UI...")
-    print("Open http://localhost:8080 in your browser")
+    print(f"Open http://localhost:8080 in your browser (event loop: {loop})")
     print()
     uvicorn.run(
         "web.backend.main:app",
@@ -13,6 +27,8 @@ def main():
         port=8080,
         reload=False,
         log_level="info",
+        loop=loop,
+        workers=1,
     )
 
 